@@ -4,7 +4,9 @@ CLI commands for config migrator.
 Implements the main command-line interface following the flowchart steps.
 """
 
+import re
 from pathlib import Path
+from typing import Optional
 
 import click
 from rich.console import Console
@@ -13,11 +15,14 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
 from cvpilot.core.merger import ConfigMerger
-from cvpilot.core.parser import YAMLParser
+from cvpilot.core.parser import get_default_parser
 from cvpilot.core.analyzer import ConflictAnalyzer, generate_rulebook_from_analysis
 from cvpilot.core.transformer import PathTransformationDetector
 from cvpilot.utils.logging import setup_logging
 
+# Trailing _X.Y.Z version suffix of an NSPREV file stem
+_VERSION_SUFFIX_RE = re.compile(r"_\d+\.\d+\.\d+$")
+
 
 def _show_integrated_summary(
     console: Console,
@@ -25,26 +30,24 @@ def _show_integrated_summary(
     engprev_data: dict,
     engnew_data: dict,
     final_config: dict,
+    diff_data: Optional[dict] = None,
 ):
-    """Show detailed merge summary for integrated workflow."""
+    """Show detailed merge summary for integrated workflow.
+
+    When the Stage 1 diff already computed by the workflow is passed in as
+    ``diff_data`` it is reused instead of re-running Stage 1.
+    """
     console.print("\n[bold blue]Complete Workflow Summary[/bold blue]")
 
     # Count keys at each level
-    def count_keys(data: dict) -> int:
-        count = 0
-        for value in data.values():
-            if isinstance(value, dict):
-                count += count_keys(value)
-            else:
-                count += 1
-        return count
+    count_keys = ConfigMerger.count_leaf_keys
 
     # Stage 1 stats
     engprev_keys = count_keys(engprev_data)
     nsprev_overrides = count_keys(nsprev_data)
-    stage1_keys = count_keys(
-        ConfigMerger.merge_configs_stage1(nsprev_data, engprev_data)
-    )
+    if diff_data is None:
+        diff_data = ConfigMerger.merge_configs_stage1(nsprev_data, engprev_data)
+    stage1_keys = count_keys(diff_data)
 
     # Stage 2 stats
     engnew_keys = count_keys(engnew_data)
@@ -121,7 +124,7 @@ def _generate_output_filename(nsprev_file: Path, engnew_data: dict) -> str:
         engnew_version = global_section.get("version")
     if not engnew_version:
         # Try any other tag fields as last resort
-        for tag_field in ["nrfTag", "gwTag", "helmTestTag", "appInfoTag"]:
+        for tag_field in ("nrfTag", "gwTag", "helmTestTag", "appInfoTag"):
             engnew_version = global_section.get(tag_field)
             if engnew_version:
                 break
@@ -131,9 +134,7 @@ def _generate_output_filename(nsprev_file: Path, engnew_data: dict) -> str:
 
     # Remove version from nsprev filename if it exists
     # Pattern: remove _X.Y.Z from the end
-    import re
-
-    base_name = re.sub(r"_\d+\.\d+\.\d+$", "", nsprev_stem)
+    base_name = _VERSION_SUFFIX_RE.sub("", nsprev_stem)
 
     # Generate new filename
     return f"{base_name}_{engnew_version}.yaml"
@@ -319,7 +320,7 @@ def migrate(
 
     try:
         # Initialize YAML parser
-        parser = YAMLParser()
+        parser = get_default_parser()
 
         # Validate all three files
         logger.info("Step 1: Validating all input files")
@@ -384,38 +385,35 @@ def migrate(
         
         comment_merger = CommentPreservingMerger()
         
-        # Create temporary file for comment-preserving merge
+        # Create temporary file for comment-preserving merge, writing through
+        # the handle that is already open instead of reopening it by name
         import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as temp_file:
+        with tempfile.NamedTemporaryFile(
+            mode='w', suffix='.yaml', encoding='utf-8', delete=False
+        ) as temp_file:
             temp_engnew_path = temp_file.name
-            comment_merger.save_with_comments(engnew_data, temp_engnew_path)
+            comment_merger.yaml.dump(engnew_data, temp_file)
         
         try:
             # Use rulebook-based merging if rules file is provided
             if rules and rules.exists():
                 logger.info(f"Using rulebook-based merging with rules: {rules}")
-                # Use comment-preserving merge even with rulebook
-                comment_merger.merge_with_comments(
-                    temp_engnew_path,
-                    diff_data,
-                    output
-                )
-                # Load the result to continue with Stage 3
-                final_config = comment_merger.load_with_comments(output)
-            else:
-                # Use comment-preserving merge
-                comment_merger.merge_with_comments(
-                    temp_engnew_path,
-                    diff_data,
-                    output
-                )
-                # Load the result to continue with Stage 3
-                final_config = comment_merger.load_with_comments(output)
+            # Use comment-preserving merge (even with rulebook); the merged
+            # document it returns is what was just written, so continue with
+            # Stage 3 on it instead of loading the output file again
+            final_config = comment_merger.merge_with_comments(
+                temp_engnew_path,
+                diff_data,
+                output
+            )
         finally:
-            # Clean up temporary file
+            # Clean up temporary file; unlink directly rather than stat first,
+            # a file that is already gone is simply nothing to clean up
             import os
-            if os.path.exists(temp_engnew_path):
+            try:
                 os.unlink(temp_engnew_path)
+            except FileNotFoundError:
+                pass
 
         # Apply version replacement to ensure consistency
         progress.update(task, description="Applying version normalization...")
@@ -499,7 +497,8 @@ def migrate(
         # Show summary if requested
         if summary:
             _show_integrated_summary(
-                console, nsprev_data, engprev_data, engnew_data, final_config
+                console, nsprev_data, engprev_data, engnew_data, final_config,
+                diff_data=diff_data,
             )
 
         logger.info("Complete workflow finished successfully")
@@ -558,7 +557,9 @@ def generate_rules(
         # Save rulebook
         with open(output, 'w', encoding='utf-8') as f:
             import yaml
-            yaml.dump(rulebook_content, f, default_flow_style=False, sort_keys=False)
+            # libyaml-backed dumper when PyYAML was built with it; same output
+            dumper = getattr(yaml, "CDumper", yaml.Dumper)
+            yaml.dump(rulebook_content, f, Dumper=dumper, default_flow_style=False, sort_keys=False)
         
         # Show summary
         summary = analysis.get('summary', {})
@@ -6,9 +6,60 @@ merge strategy suggestions for list-type fields (annotations, labels, etc.).
 """
 
 import copy
-from typing import Any, Dict, List, Set, Tuple, Optional
-from pathlib import Path
+import os
+import re
+from typing import Any, Counter, Dict, List, Mapping, Pattern, Set, Tuple, Optional
 from enum import Enum
+from types import MappingProxyType
+
+from cvpilot.core.parser import YAMLParser, get_default_parser
+
+# Top-level keys of NRF microservices; kept outside ComponentType because any
+# class attribute of an Enum becomes a member
+_NRF_SERVICE_KEYS = (
+    'nfregistration', 'nfsubscription', 'nfdiscovery',
+    'nfaccesstoken', 'nrfconfiguration', 'nrfauditor'
+)
+
+# Shared read-only default for lookups that only read a missing sub-mapping;
+# being immutable, one instance can safely stand in for a fresh {} each time
+_EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+
+# Filename markers in match order, with the ComponentType member they select.
+# The "oc"-prefixed names contain these, so they need no separate check
+_FILENAME_MARKERS = (
+    ('nrf', 'NRF'), ('cndbtier', 'CNDBTIER'), ('udr', 'UDR'), ('udm', 'UDM'),
+    ('ausf', 'AUSF'), ('nssf', 'NSSF'), ('pcf', 'PCF')
+)
+
+
+def _contains_text(data: Any, needle: str) -> bool:
+    """
+    Check whether any key or scalar value in a nested structure contains text.
+
+    Walks the structure once and stops at the first hit, instead of rendering
+    the whole tree with str() and searching the result.
+
+    Args:
+        data: Nested dict/list structure
+        needle: Lowercase text to look for
+
+    Returns:
+        True if the text occurs (case-insensitively) in a key or scalar value
+    """
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if needle in str(key).lower():
+                    return True
+                stack.append(value)
+        elif isinstance(node, (list, tuple)):
+            stack.extend(node)
+        elif needle in str(node).lower():
+            return True
+    return False
 
 
 class ComponentType(Enum):
@@ -35,22 +86,10 @@ class ComponentType(Enum):
         """
         filename_lower = filename.lower()
 
-        if "ocnrf" in filename_lower or "nrf" in filename_lower:
-            return cls.NRF
-        elif "occndbtier" in filename_lower or "cndbtier" in filename_lower:
-            return cls.CNDBTIER
-        elif "ocudr" in filename_lower or "udr" in filename_lower:
-            return cls.UDR
-        elif "ocudm" in filename_lower or "udm" in filename_lower:
-            return cls.UDM
-        elif "ocausf" in filename_lower or "ausf" in filename_lower:
-            return cls.AUSF
-        elif "ocnssf" in filename_lower or "nssf" in filename_lower:
-            return cls.NSSF
-        elif "ocpcf" in filename_lower or "pcf" in filename_lower:
-            return cls.PCF
-        else:
-            return cls.UNKNOWN
+        for marker, member in _FILENAME_MARKERS:
+            if marker in filename_lower:
+                return cls[member]
+        return cls.UNKNOWN
 
     @classmethod
     def detect_from_content(cls, data: Dict[str, Any]) -> 'ComponentType':
@@ -64,18 +103,14 @@ class ComponentType(Enum):
             Detected component type
         """
         # Check for component-specific markers in global section
-        global_section = data.get('global', {})
+        global_section = data.get('global', _EMPTY_MAPPING)
 
         # NRF-specific markers
         if 'nrfTag' in global_section or 'nrfInstanceId' in global_section:
             return cls.NRF
 
         # Check for NRF microservices
-        nrf_services = [
-            'nfregistration', 'nfsubscription', 'nfdiscovery',
-            'nfaccesstoken', 'nrfconfiguration', 'nrfauditor'
-        ]
-        if any(service in data for service in nrf_services):
+        if any(service in data for service in _NRF_SERVICE_KEYS):
             return cls.NRF
 
         # Check for ingress/egress gateway pattern (NRF)
@@ -87,7 +122,7 @@ class ComponentType(Enum):
             return cls.CNDBTIER
 
         # Check for CNDBTIER namespace or service indicators
-        if 'occne-cndbtier' in str(data).lower():
+        if _contains_text(data, 'occne-cndbtier'):
             return cls.CNDBTIER
 
         # Check for CNDBTIER-specific configuration patterns
@@ -131,11 +166,22 @@ class ConflictAnalyzer:
         'customer.oracle.com', 'nrf.customer.com', 'prod.nrf'
     }
 
-    def __init__(self):
-        self.conflicts = []
-        self.suggestions = {}
+    # All site-specific patterns as one alternation, so a text is scanned once
+    SITE_SPECIFIC_RE = re.compile(
+        '|'.join(re.escape(pattern) for pattern in sorted(SITE_SPECIFIC_PATTERNS))
+    )
+
+    def __init__(self, parser: Optional[YAMLParser] = None):
+        self.conflicts: List[Dict[str, Any]] = []
+        self.suggestions: Dict[str, Dict[str, Any]] = {}
         self.detected_component = ComponentType.UNKNOWN
         self.list_field_names = self.BASE_LIST_FIELD_NAMES
+        # Key -> is-target-field results, valid for _field_match_names only
+        self._field_match_cache: Dict[str, bool] = {}
+        self._field_match_names = self.list_field_names
+        self._field_match_re = self._compile_field_names(self.list_field_names)
+        # Defaults to the shared parser on first use and is kept afterwards
+        self._parser = parser
     
     def analyze_files(self, nsprev_path: str, engnew_path: str) -> Dict[str, Any]:
         """
@@ -148,11 +194,11 @@ class ConflictAnalyzer:
         Returns:
             Dictionary with analysis results and suggestions
         """
-        from cvpilot.core.parser import YAMLParser
-
-        parser = YAMLParser()
-        nsprev_data = parser.load_yaml_file(nsprev_path)
-        engnew_data = parser.load_yaml_file(engnew_path)
+        parser = self._parser
+        if parser is None:
+            # Analysis only reads values, so skip round-trip loading
+            parser = self._parser = get_default_parser(format_preserving_load=False)
+        nsprev_data, engnew_data = parser.load_yaml_files([nsprev_path, engnew_path])
 
         # Detect component type from files
         self._detect_component_type(nsprev_path, engnew_path, nsprev_data, engnew_data)
@@ -188,8 +234,8 @@ class ConflictAnalyzer:
             engnew_data: ENGNEW data
         """
         # Try filename detection first
-        nsprev_component = ComponentType.detect_from_filename(Path(nsprev_path).name)
-        engnew_component = ComponentType.detect_from_filename(Path(engnew_path).name)
+        nsprev_component = ComponentType.detect_from_filename(os.path.basename(nsprev_path))
+        engnew_component = ComponentType.detect_from_filename(os.path.basename(engnew_path))
 
         # If both files suggest the same component, use that
         if nsprev_component != ComponentType.UNKNOWN and nsprev_component == engnew_component:
@@ -216,45 +262,92 @@ class ConflictAnalyzer:
             self.BASE_LIST_FIELD_NAMES
         )
     
-    def _find_all_list_fields(self, data: Dict[str, Any], path: str = "") -> Dict[str, Any]:
+    def _find_all_list_fields(
+        self,
+        data: Dict[str, Any],
+        path: str = "",
+        fields: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
-        Recursively find all relevant fields (both lists and dicts) in the YAML structure.
+        Find all relevant fields (both lists and dicts) in the YAML structure.
+        
+        Walks the tree with an explicit stack of item iterators, so fields are
+        collected in the same depth-first order a recursive walk would give
+        without a Python call per nested mapping.
         
         Args:
             data: YAML data to analyze
-            path: Current path in the structure
+            path: Path of data in the structure
+            fields: Mapping to fill in place (a new one if omitted)
             
         Returns:
             Dictionary mapping field paths to their values
         """
-        fields = {}
+        if fields is None:
+            fields = {}
         
-        for key, value in data.items():
-            current_path = f"{path}.{key}" if path else key
-            
-            if isinstance(value, dict):
-                # Check if this dict field is one we care about
-                field_name = key.lower()
-                if any(list_field in field_name for list_field in self.list_field_names):
-                    # This is a target field (like commonlabels dict)
-                    fields[current_path] = value
-                else:
-                    # Recursively search nested dictionaries
-                    nested_fields = self._find_all_list_fields(value, current_path)
-                    fields.update(nested_fields)
-            elif isinstance(value, list):
-                # Check if this is a list-type field we care about
-                field_name = key.lower()
-                if any(list_field in field_name for list_field in self.list_field_names):
+        is_target_field = self._is_target_field
+        stack = [(path, iter(data.items()))]
+        while stack:
+            parent_path, items = stack[-1]
+            for key, value in items:
+                current_path = f"{parent_path}.{key}" if parent_path else key
+                
+                # A target field is collected whatever its type (list, dict like
+                # commonlabels, or scalar)
+                if is_target_field(key):
                     fields[current_path] = value
+                elif isinstance(value, dict):
+                    # Descend into the nested mapping, then resume this one
+                    stack.append((current_path, iter(value.items())))
+                    break
             else:
-                # Check if this is a dict-type field we care about (like commonlabels)
-                field_name = key.lower()
-                if any(list_field in field_name for list_field in self.list_field_names):
-                    fields[current_path] = value
+                stack.pop()
         
         return fields
     
+    def _is_target_field(self, key: str) -> bool:
+        """
+        Check if a key names one of the analyzed fields, caching per key.
+        
+        The cache is dropped whenever list_field_names is replaced, e.g. after
+        component detection.
+        
+        Args:
+            key: Field key
+            
+        Returns:
+            True if the key contains one of the analyzed field names
+        """
+        if self._field_match_names is not self.list_field_names:
+            self._field_match_cache = {}
+            self._field_match_names = self.list_field_names
+            self._field_match_re = self._compile_field_names(self.list_field_names)
+        
+        try:
+            return self._field_match_cache[key]
+        except KeyError:
+            pass
+        
+        is_target = self._field_match_re.search(key.lower()) is not None
+        self._field_match_cache[key] = is_target
+        return is_target
+    
+    @staticmethod
+    def _compile_field_names(field_names: Set[str]) -> Pattern:
+        """
+        Compile field names into one alternation regex for substring search.
+        
+        Args:
+            field_names: Field names to look for
+            
+        Returns:
+            Regex that finds any of the names inside a string
+        """
+        if not field_names:
+            return re.compile(r'(?!)')
+        return re.compile('|'.join(re.escape(name) for name in sorted(field_names)))
+    
     def _detect_conflicts(self, nsprev_lists: Dict[str, Any], engnew_lists: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Detect conflicts between NSPREV and ENGNEW fields.
@@ -268,37 +361,26 @@ class ConflictAnalyzer:
         """
         conflicts = []
         
-        # Find fields that exist in both files
-        common_paths = set(nsprev_lists.keys()) & set(engnew_lists.keys())
+        # Find fields that exist in both files (keys views intersect
+        # directly, without first copying each side into a set)
+        common_paths = nsprev_lists.keys() & engnew_lists.keys()
         
-        # Also check for field name matches (e.g., commonlabels at different paths)
-        nsprev_by_field = {}
-        engnew_by_field = {}
-        
-        for path, value in nsprev_lists.items():
-            field_name = path.split('.')[-1]
-            if field_name not in nsprev_by_field:
-                nsprev_by_field[field_name] = []
-            nsprev_by_field[field_name].append((path, value))
-        
-        for path, value in engnew_lists.items():
-            field_name = path.split('.')[-1]
-            if field_name not in engnew_by_field:
-                engnew_by_field[field_name] = []
-            engnew_by_field[field_name].append((path, value))
+        # Also check for field name matches (e.g., commonlabels at different paths).
+        # Paths only pair up when their last two segments agree, so ENGNEW is
+        # indexed by that relative path once; later paths overwrite earlier
+        # ones, so the last ENGNEW match wins as before
+        engnew_by_relative = {
+            '.'.join(path.rsplit('.', 2)[-2:]): value
+            for path, value in engnew_lists.items()
+        }
         
         # Check for field name conflicts (same field name, different paths)
-        for field_name in set(nsprev_by_field.keys()) & set(engnew_by_field.keys()):
-            for nsprev_path, nsprev_value in nsprev_by_field[field_name]:
-                for engnew_path, engnew_value in engnew_by_field[field_name]:
-                    # Only compare if they're at the same relative path
-                    nsprev_relative = '.'.join(nsprev_path.split('.')[-2:]) if '.' in nsprev_path else nsprev_path
-                    engnew_relative = '.'.join(engnew_path.split('.')[-2:]) if '.' in engnew_path else engnew_path
-                    
-                    if nsprev_relative == engnew_relative:
-                        common_paths.add(nsprev_path)
-                        # Update engnew_lists to include this path for comparison
-                        engnew_lists[nsprev_path] = engnew_value
+        for nsprev_path in nsprev_lists:
+            relative = '.'.join(nsprev_path.rsplit('.', 2)[-2:])
+            if relative in engnew_by_relative:
+                common_paths.add(nsprev_path)
+                # Update engnew_lists to include this path for comparison
+                engnew_lists[nsprev_path] = engnew_by_relative[relative]
         
         for path in common_paths:
             nsprev_val = nsprev_lists[path]
@@ -349,12 +431,20 @@ class ConflictAnalyzer:
         
         # For list of dicts, compare by key-value pairs
         if list1 and isinstance(list1[0], dict) and list2 and isinstance(list2[0], dict):
-            list1_keys = {self._get_dict_key(item) for item in list1 if self._get_dict_key(item)}
-            list2_keys = {self._get_dict_key(item) for item in list2 if self._get_dict_key(item)}
+            # One _get_dict_key call per item, rather than one to test the
+            # key and another to collect it
+            get_dict_key = self._get_dict_key
+            list1_keys = {key for key in map(get_dict_key, list1) if key}
+            list2_keys = {key for key in map(get_dict_key, list2) if key}
             return bool(list1_keys - list2_keys)
         
-        # For simple lists, check for items not in list2
-        return any(item not in list2 for item in list1)
+        # For simple lists, check for items not in list2 via a set when the
+        # items are hashable, falling back to list scans otherwise
+        try:
+            list2_items = set(list2)
+            return any(item not in list2_items for item in list1)
+        except TypeError:
+            return any(item not in list2 for item in list1)
     
     def _get_dict_key(self, item: Dict[str, Any]) -> Optional[str]:
         """
@@ -367,7 +457,7 @@ class ConflictAnalyzer:
             The key name or None if not found
         """
         if isinstance(item, dict) and len(item) == 1:
-            return list(item.keys())[0]
+            return next(iter(item))
         return None
     
     def _calculate_site_specific_score(self, items: List[Any]) -> float:
@@ -389,19 +479,16 @@ class ConflictAnalyzer:
         if total_items == 0:
             return 0.0
         
+        site_re = self.SITE_SPECIFIC_RE
         for item in items:
             if isinstance(item, dict):
                 for key, value in item.items():
                     # Check for site-specific patterns
-                    for pattern in self.SITE_SPECIFIC_PATTERNS:
-                        if pattern in key or pattern in str(value):
-                            score += 1.0
-                            break
-            elif isinstance(item, str):
-                for pattern in self.SITE_SPECIFIC_PATTERNS:
-                    if pattern in item:
+                    if site_re.search(key) or site_re.search(str(value)):
                         score += 1.0
-                        break
+            elif isinstance(item, str):
+                if site_re.search(item):
+                    score += 1.0
         
         return min(score / total_items, 1.0)
     
@@ -511,16 +598,20 @@ class ConflictAnalyzer:
                 'suggested_engnew': 0
             }
         
-        suggested_merges = sum(1 for s in self.suggestions.values() if s['suggested_strategy'] == 'merge')
-        suggested_nsprev = sum(1 for s in self.suggestions.values() if s['suggested_strategy'] == 'nsprev')
-        suggested_engnew = sum(1 for s in self.suggestions.values() if s['suggested_strategy'] == 'engnew')
+        # Single pass over the suggestions for both tallies
+        by_strategy: Counter[str] = Counter()
+        high_confidence = 0
+        for suggestion in self.suggestions.values():
+            by_strategy[suggestion['suggested_strategy']] += 1
+            if suggestion['confidence'] > 0.8:
+                high_confidence += 1
         
         return {
             'total_conflicts': len(self.conflicts),
-            'suggested_merges': suggested_merges,
-            'suggested_nsprev': suggested_nsprev,
-            'suggested_engnew': suggested_engnew,
-            'high_confidence': sum(1 for s in self.suggestions.values() if s['confidence'] > 0.8)
+            'suggested_merges': by_strategy['merge'],
+            'suggested_nsprev': by_strategy['nsprev'],
+            'suggested_engnew': by_strategy['engnew'],
+            'high_confidence': high_confidence
         }
 
 
@@ -630,10 +721,13 @@ def generate_rulebook_from_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
     # Add path-specific overrides based on suggestions
     suggestions = analysis.get('suggestions', {})
     for path, suggestion in suggestions.items():
-        # Include structural mismatches and high-confidence suggestions
-        if (suggestion['confidence'] > 0.7 or 
-            'structural mismatch' in suggestion['reason'].lower() or
-            suggestion['suggested_strategy'] == 'nsprev'):
+        # Include structural mismatches and high-confidence suggestions.
+        # Cheap comparisons go first; structural mismatches found by the
+        # analyzer are always 'nsprev', so the reason text is only scanned
+        # for hand-built suggestions.
+        if (suggestion['suggested_strategy'] == 'nsprev' or
+            suggestion['confidence'] > 0.7 or
+            'structural mismatch' in suggestion['reason'].lower()):
             rulebook['path_overrides'][path] = {
                 'strategy': suggestion['suggested_strategy']
             }
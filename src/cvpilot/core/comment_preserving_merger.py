@@ -6,16 +6,20 @@ while applying only specific NSPREV values that differ from ENGPREV.
 """
 
 import copy
-from typing import Any, Dict, Optional
-from ruamel.yaml import YAML
-from ruamel.yaml.comments import CommentedMap, CommentedSeq
+import io
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 class CommentPreservingMerger:
     """Merger that preserves comments and structure from ENGNEW while applying NSPREV values."""
     
+    __slots__ = ('yaml',)
+    
     def __init__(self):
         """Initialize the merger."""
+        # Imported here so ruamel.yaml is only loaded once a merger is built
+        from ruamel.yaml import YAML
+
         self.yaml = YAML()
         self.yaml.preserve_quotes = True
         self.yaml.width = 1000
@@ -26,7 +30,7 @@ class CommentPreservingMerger:
         engnew_file: str,
         diff_file: Dict[str, Any],
         output_file: str
-    ) -> None:
+    ) -> Any:
         """
         Merge ENGNEW with DIFF while preserving comments and structure.
         
@@ -34,39 +38,22 @@ class CommentPreservingMerger:
             engnew_file: Path to ENGNEW YAML file (source of comments/structure)
             diff_file: DIFF data (NSPREV customizations to apply)
             output_file: Path to output file
+            
+        Returns:
+            The merged document as written to output_file (comments preserved)
         """
-        # Load ENGNEW with comments preserved
-        with open(engnew_file, encoding="utf-8") as f:
+        # Load ENGNEW with comments preserved; ruamel decodes the raw bytes
+        with open(engnew_file, "rb") as f:
             engnew_data = self.yaml.load(f)
         
-        # Apply DIFF values to ENGNEW structure
-        result = self._apply_diff_to_engnew(engnew_data, diff_file)
+        # Apply DIFF values to ENGNEW structure. The document was just loaded
+        # and is not shared, so it is updated in place rather than copied.
+        self._apply_diff_recursive(engnew_data, diff_file, "")
         
         # Save with comments preserved
-        with open(output_file, "w", encoding="utf-8") as f:
-            self.yaml.dump(result, f)
-    
-    def _apply_diff_to_engnew(
-        self,
-        engnew_data: CommentedMap,
-        diff_data: Dict[str, Any]
-    ) -> CommentedMap:
-        """
-        Apply DIFF values to ENGNEW structure while preserving comments.
-        
-        Args:
-            engnew_data: ENGNEW data with comments
-            diff_data: DIFF data to apply
-            
-        Returns:
-            ENGNEW data with DIFF values applied and comments preserved
-        """
-        result = copy.deepcopy(engnew_data)
+        self.save_with_comments(engnew_data, output_file)
         
-        # Apply DIFF values recursively
-        self._apply_diff_recursive(result, diff_data, "")
-        
-        return result
+        return engnew_data
     
     def _apply_diff_recursive(
         self,
@@ -75,51 +62,74 @@ class CommentPreservingMerger:
         path: str
     ) -> None:
         """
-        Recursively apply DIFF values to ENGNEW structure.
+        Apply DIFF values to ENGNEW structure, walking nested pairs with an
+        explicit stack of item iterators instead of recursing.
+        
+        Values are applied in document order, exactly as a recursive walk
+        would, so the last write wins when ENGNEW nodes are aliased.
         
         Args:
             engnew_obj: ENGNEW object (CommentedMap/CommentedSeq)
             diff_obj: DIFF object to apply
             path: Current path for debugging
         """
-        if isinstance(diff_obj, dict) and isinstance(engnew_obj, (CommentedMap, dict)):
-            # Both are dictionaries - merge recursively
-            for key, diff_value in diff_obj.items():
-                if key in engnew_obj:
-                    # Key exists in ENGNEW - apply DIFF value
-                    if isinstance(diff_value, dict) and isinstance(engnew_obj[key], (CommentedMap, dict)):
-                        # Both are dicts - recurse
-                        self._apply_diff_recursive(engnew_obj[key], diff_value, f"{path}.{key}")
-                    else:
-                        # Apply DIFF value (scalar or different type)
-                        engnew_obj[key] = copy.deepcopy(diff_value)
-                else:
-                    # Key doesn't exist in ENGNEW - add from DIFF
-                    engnew_obj[key] = copy.deepcopy(diff_value)
+        deepcopy = copy.deepcopy
+        # CommentedMap and CommentedSeq subclass dict and list, so plain
+        # isinstance checks cover both the loaded and the DIFF structures.
+        # Each frame holds the ENGNEW container, an iterator over the DIFF
+        # items still to apply, the path, and the ENGNEW length for lists
+        # (None for dicts).
+        stack: List[Tuple[Any, Iterator[Tuple[Any, Any]], str, Optional[int]]]
+        if isinstance(diff_obj, dict) and isinstance(engnew_obj, dict):
+            stack = [(engnew_obj, iter(diff_obj.items()), path, None)]
+        elif isinstance(diff_obj, list) and isinstance(engnew_obj, list):
+            stack = [(engnew_obj, enumerate(diff_obj), path, len(engnew_obj))]
+        else:
+            # For scalar values or type mismatches there is nothing to walk
+            return
         
-        elif isinstance(diff_obj, list) and isinstance(engnew_obj, (CommentedSeq, list)):
-            # Both are lists - apply DIFF values by index
-            for i, diff_item in enumerate(diff_obj):
-                if i < len(engnew_obj):
-                    # Index exists in ENGNEW - apply DIFF item
-                    if isinstance(diff_item, dict) and isinstance(engnew_obj[i], (CommentedMap, dict)):
-                        # Both are dicts - recurse
-                        self._apply_diff_recursive(engnew_obj[i], diff_item, f"{path}[{i}]")
+        while stack:
+            engnew_obj, diff_items, path, engnew_len = stack[-1]
+            for key, diff_value in diff_items:
+                if engnew_len is None:
+                    # Both are dictionaries - merge level by level
+                    if key in engnew_obj:
+                        # Key exists in ENGNEW - apply DIFF value
+                        engnew_value = engnew_obj[key]
+                        if isinstance(diff_value, dict) and isinstance(engnew_value, dict):
+                            # Both are dicts - descend, then resume this level
+                            stack.append((engnew_value, iter(diff_value.items()), f"{path}.{key}", None))
+                            break
+                        # Apply DIFF value (scalar or different type)
+                        engnew_obj[key] = deepcopy(diff_value)
                     else:
-                        # Apply DIFF item (scalar or different type)
-                        engnew_obj[i] = copy.deepcopy(diff_item)
+                        # Key doesn't exist in ENGNEW - add from DIFF
+                        engnew_obj[key] = deepcopy(diff_value)
+                elif key < engnew_len:
+                    # Both are lists - index exists in ENGNEW, apply DIFF item
+                    engnew_item = engnew_obj[key]
+                    if isinstance(diff_value, dict) and isinstance(engnew_item, dict):
+                        # Both are dicts - descend, then resume this level
+                        stack.append((engnew_item, iter(diff_value.items()), f"{path}[{key}]", None))
+                        break
+                    # Apply DIFF item (scalar or different type)
+                    engnew_obj[key] = deepcopy(diff_value)
                 else:
                     # Index doesn't exist in ENGNEW - add from DIFF
-                    engnew_obj.append(copy.deepcopy(diff_item))
-        
-        # For scalar values or type mismatches, DIFF value is already applied above
+                    engnew_obj.append(deepcopy(diff_value))
+            else:
+                stack.pop()
     
     def load_with_comments(self, file_path: str):
         """Load YAML file with comments preserved."""
-        with open(file_path, encoding="utf-8") as f:
+        with open(file_path, "rb") as f:
             return self.yaml.load(f)
     
     def save_with_comments(self, data, file_path: str) -> None:
         """Save YAML data with comments preserved."""
+        # Render into memory first so the emitter's many small writes never
+        # reach the file object; the file gets one write
+        buffer = io.StringIO()
+        self.yaml.dump(data, buffer)
         with open(file_path, "w", encoding="utf-8") as f:
-            self.yaml.dump(data, f)
+            f.write(buffer.getvalue())
@@ -9,7 +9,70 @@ Implements the core logic for merging YAML configurations according to the flowc
 
 import copy
 import re
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, cast, overload
+
+K = TypeVar('K')
+V = TypeVar('V')
+T = TypeVar('T')
+
+# Version strings in X.Y.Z format
+_VERSION_RE = re.compile(r'\b(\d+\.\d+\.\d+)\b')
+
+# Marks an NSPREV subtree that has to be looked up from the root by path
+_UNRESOLVED = object()
+
+# Exact scalar types that are immutable, so a copy can share them. Subclasses
+# (e.g. ruamel's quoted strings and formatted numbers) are not listed and
+# still go through copy.deepcopy
+_ATOMIC_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+# Typed per argument so callers keep the type of the tree they copy
+@overload
+def _clone(value: Dict[K, V]) -> Dict[K, V]: ...
+@overload
+def _clone(value: List[T]) -> List[T]: ...
+@overload
+def _clone(value: T) -> T: ...
+def _clone(value: Any) -> Any:
+    """
+    Copy a configuration tree, walking plain containers directly.
+
+    Plain dicts and lists are rebuilt recursively, which is much cheaper than
+    ``copy.deepcopy``'s memo bookkeeping for acyclic config trees, and plain
+    immutable scalars are returned as they are. Anything else (ruamel
+    CommentedMap/CommentedSeq with their comment metadata, or scalar
+    subclasses) is handed to ``copy.deepcopy`` unchanged.
+
+    Args:
+        value: Value to copy
+
+    Returns:
+        Independent copy of the value
+    """
+    value_type = type(value)
+    if value_type in _ATOMIC_TYPES:
+        return value
+    if value_type is dict:
+        return {key: _clone(item) for key, item in value.items()}
+    if value_type is list:
+        return [_clone(item) for item in value]
+    return copy.deepcopy(value)
+
+
+@lru_cache(maxsize=4096)
+def _split_path(path: str) -> Tuple[str, ...]:
+    """
+    Split a dot-notation path into its keys, caching the result per path.
+
+    Args:
+        path: Dot notation path (e.g., "api.externalService.annotations")
+
+    Returns:
+        Tuple of keys
+    """
+    return tuple(path.split('.'))
 
 
 class ConfigMerger:
@@ -27,7 +90,7 @@ class ConfigMerger:
         Returns:
             Merged dictionary
         """
-        result = copy.deepcopy(base)
+        result = _clone(base)
 
         for key, value in override.items():
             if (
@@ -39,7 +102,7 @@ class ConfigMerger:
                 result[key] = ConfigMerger.deep_merge(result[key], value)
             else:
                 # Override with new value (including lists)
-                result[key] = copy.deepcopy(value)
+                result[key] = _clone(value)
 
         return result
 
@@ -82,8 +145,9 @@ class ConfigMerger:
         Returns:
             Merged configuration dictionary with ENGNEW structure and NSPREV customizations
         """
-        # Start with ENGNEW as foundation
-        result = copy.deepcopy(engnew)
+        # Start with a private copy of ENGNEW as foundation; the overlay below
+        # path-copies, so the result may share subtrees with this copy
+        result = _clone(engnew)
         
         # Apply DIFF values only for keys that exist in ENGNEW
         result = ConfigMerger._selective_overlay(result, diff_file)
@@ -100,7 +164,7 @@ class ConfigMerger:
         - New: Include new keys from either file
         - Deletion: Ignore deletions (don't remove keys)
         """
-        result = copy.deepcopy(base)
+        result = _clone(base)
 
         for key, value in override.items():
             if (
@@ -112,7 +176,7 @@ class ConfigMerger:
                 result[key] = ConfigMerger._merge_with_stage2_rules(result[key], value)
             else:
                 # Modify: Use value from diff_nstf_etf.yml (NSTF precedence)
-                result[key] = copy.deepcopy(value)
+                result[key] = _clone(value)
 
         return result
 
@@ -131,7 +195,12 @@ class ConfigMerger:
         Returns:
             ENGNEW with NSPREV customizations applied only for existing keys
         """
-        result = copy.deepcopy(engnew)
+        # Path-copy: only containers on an overlaid path are copied, untouched
+        # ENGNEW subtrees are shared with the input
+        result = copy.copy(engnew)
+        if not diff_file:
+            # Nothing to overlay at or below this level
+            return result
 
         for key, value in engnew.items():
             if key in diff_file:
@@ -149,7 +218,7 @@ class ConfigMerger:
                     result[key] = ConfigMerger._merge_list_items(value, diff_file[key])
                 else:
                     # Apply DIFF value for matching key (scalar values)
-                    result[key] = copy.deepcopy(diff_file[key])
+                    result[key] = _clone(diff_file[key])
             # If key not in diff_file, keep original ENGNEW value
 
         return result
@@ -166,7 +235,8 @@ class ConfigMerger:
         Returns:
             Merged list with ENGNEW structure and DIFF values applied
         """
-        result = copy.deepcopy(engnew_list)
+        # Items past the DIFF list stay shared with the input
+        result = copy.copy(engnew_list)
         
         # Apply DIFF values for matching indices
         for i, diff_item in enumerate(diff_list):
@@ -174,10 +244,10 @@ class ConfigMerger:
                 if isinstance(result[i], dict) and isinstance(diff_item, dict):
                     # For list items that are dictionaries, replace entirely instead of merging
                     # This prevents creating dictionaries with multiple keys that break YAML formatting
-                    result[i] = copy.deepcopy(diff_item)
+                    result[i] = _clone(diff_item)
                 else:
                     # Replace scalar values or non-dict items
-                    result[i] = copy.deepcopy(diff_item)
+                    result[i] = _clone(diff_item)
         
         return result
 
@@ -202,10 +272,12 @@ class ConfigMerger:
             if key not in config1:
                 differences[key] = value
             elif isinstance(value, dict) and isinstance(config1[key], dict):
+                if not ConfigMerger._values_differ(value, config1[key]):
+                    continue
                 nested_diff = ConfigMerger.compare_configs(config1[key], value)
                 if nested_diff:
                     differences[key] = nested_diff
-            elif value != config1[key]:
+            elif ConfigMerger._values_differ(value, config1[key]):
                 differences[key] = value
 
         return differences
@@ -225,17 +297,6 @@ class ConfigMerger:
         Returns:
             Summary dictionary with merge statistics
         """
-
-        # Count keys at each level
-        def count_keys(data: Dict[str, Any]) -> int:
-            count = 0
-            for value in data.values():
-                if isinstance(value, dict):
-                    count += count_keys(value)
-                else:
-                    count += 1
-            return count
-
         # Find ENGNEW additions
         engnew_additions = ConfigMerger.compare_configs(engprev, engnew)
 
@@ -243,13 +304,58 @@ class ConfigMerger:
         nsprev_overrides = ConfigMerger.compare_configs(engprev, nsprev)
 
         return {
-            "engprev_keys": count_keys(engprev),
-            "engnew_additions": count_keys(engnew_additions),
-            "nsprev_overrides": count_keys(nsprev_overrides),
+            "engprev_keys": ConfigMerger.count_leaf_keys(engprev),
+            "engnew_additions": ConfigMerger.count_leaf_keys(engnew_additions),
+            "nsprev_overrides": ConfigMerger.count_leaf_keys(nsprev_overrides),
             "engnew_additions_detail": engnew_additions,
             "nsprev_overrides_detail": nsprev_overrides,
         }
 
+    @staticmethod
+    def count_leaf_keys(data: Dict[str, Any]) -> int:
+        """
+        Count the non-dict values in a configuration, at any nesting level.
+
+        Walks nested dictionaries with an explicit stack instead of recursing.
+
+        Args:
+            data: Configuration dictionary
+
+        Returns:
+            Number of keys whose value is not a dictionary
+        """
+        count = 0
+        stack = [data]
+        while stack:
+            for value in stack.pop().values():
+                if isinstance(value, dict):
+                    stack.append(value)
+                else:
+                    count += 1
+        return count
+
+    @staticmethod
+    def _values_differ(value: Any, other: Any) -> bool:
+        """
+        Check whether two values differ, short-circuiting before a deep comparison.
+
+        Args:
+            value: First value
+            other: Second value
+
+        Returns:
+            True if the values are not equal
+        """
+        if value is other:
+            return False
+        # Containers of different sizes can never be equal
+        if (isinstance(value, dict) and isinstance(other, dict)) or (
+            isinstance(value, list) and isinstance(other, list)
+        ):
+            if len(value) != len(other):
+                return True
+        return cast(bool, value != other)
+
     @staticmethod
     def _get_differences(
         source: Dict[str, Any], base: Dict[str, Any]
@@ -271,15 +377,19 @@ class ConfigMerger:
         for key, value in source.items():
             if key not in base:
                 # Key is new in source (added)
-                differences[key] = copy.deepcopy(value)
+                differences[key] = _clone(value)
             elif isinstance(value, dict) and isinstance(base[key], dict):
+                # Identical subtrees are pruned with one C-level comparison
+                # instead of a Python-level walk that would find nothing
+                if not ConfigMerger._values_differ(value, base[key]):
+                    continue
                 # Both are dictionaries, recursively check for differences
                 nested_diff = ConfigMerger._get_differences(value, base[key])
                 if nested_diff:  # Only include if there are actual differences
                     differences[key] = nested_diff
-            elif value != base[key]:
+            elif ConfigMerger._values_differ(value, base[key]):
                 # Value is different (modified)
-                differences[key] = copy.deepcopy(value)
+                differences[key] = _clone(value)
             # If value == base[key], it's unchanged, so we don't include it
 
         return differences
@@ -299,12 +409,12 @@ class ConfigMerger:
         Returns:
             ENGNEW with ENGPREV keys added where missing
         """
-        result = copy.deepcopy(engnew)
+        result = _clone(engnew)
 
         for key, value in engprev.items():
             if key not in result:
                 # Key doesn't exist in ENGNEW, add it from ENGPREV
-                result[key] = copy.deepcopy(value)
+                result[key] = _clone(value)
             elif isinstance(result[key], dict) and isinstance(value, dict):
                 # Both are dictionaries, recursively merge gaps
                 result[key] = ConfigMerger._merge_engprev_gaps(result[key], value)
@@ -337,9 +447,15 @@ class ConfigMerger:
         rulebook = None
         if rulebook_path:
             rulebook = RulebookManager(rulebook_path)
+            # A rulebook without overrides or merge rules can never match a
+            # path, so skip every per-field rule lookup
+            if not rulebook.has_rules():
+                rulebook = None
         
-        # Start with ENGNEW as base (includes all new fields)
-        result = copy.deepcopy(engnew)
+        # Start with a private copy of ENGNEW as base (includes all new
+        # fields); the overlay below only path-copies, so this is the one
+        # full copy made for the whole merge
+        result = _clone(engnew)
         
         # Apply DIFF as overlay, checking rulebook for each field
         result = ConfigMerger._apply_diff_with_rulebook(result, nsprev, original_nsprev, rulebook)
@@ -363,46 +479,32 @@ class ConfigMerger:
             rulebook: Rulebook manager instance
             
         Returns:
-            Merged configuration
+            Merged configuration, sharing untouched subtrees with engnew
         """
-        result = copy.deepcopy(engnew)
-        
         # Apply DIFF as overlay, checking rulebook for each field
-        result = ConfigMerger._merge_diff_with_rulebook(result, diff, original_nsprev, rulebook, "")
+        result = ConfigMerger._merge_diff_with_rulebook(
+            engnew, diff, original_nsprev, rulebook, "", original_nsprev
+        )
         
         return result
 
     @staticmethod
-    def _has_rulebook_rule(rulebook: Optional[Any], path: str) -> bool:
+    def _get_rulebook_strategy(rulebook: Optional[Any], path: str) -> Optional[str]:
         """
-        Check if a path has an explicit rulebook rule.
+        Get the merge strategy for a path that has an explicit rulebook rule.
         
         Args:
             rulebook: Rulebook manager instance
             path: Field path to check
             
         Returns:
-            True if path has explicit rulebook rule
+            Merge strategy, or None if the path has no explicit rulebook rule
         """
         if not rulebook:
-            return False
-            
-        # Check path_overrides
-        path_overrides = rulebook.rules.get('path_overrides', {})
-        if any(rulebook._path_matches(path, override) for override in path_overrides.keys()):
-            return True
-        
-        # Check merge_rules with matching scope
-        merge_rules = rulebook.rules.get('merge_rules', {})
-        for field_name, config in merge_rules.items():
-            if config.get('scope') == 'global':
-                # Check if last segment of path matches field name
-                path_segments = path.split('.')
-                if path_segments[-1] == field_name:
-                    return True
-            # Check specific scope paths if needed
+            return None
         
-        return False
+        # Rule lookup and strategy resolution, memoised per path
+        return cast(Optional[str], rulebook.get_explicit_strategy(path))
 
     @staticmethod
     def _merge_diff_with_rulebook(
@@ -410,7 +512,8 @@ class ConfigMerger:
         diff: Dict[str, Any], 
         original_nsprev: Optional[Dict[str, Any]],
         rulebook: Optional[Any],
-        path: str
+        path: str,
+        nsprev_node: Any = _UNRESOLVED
     ) -> Dict[str, Any]:
         """
         Recursively merge DIFF with ENGNEW, checking rulebook for each field.
@@ -421,11 +524,15 @@ class ConfigMerger:
             original_nsprev: Original NSPREV data for fallback
             rulebook: Rulebook manager instance
             path: Current path in the structure
+            nsprev_node: Value of original_nsprev at path, walked down in lockstep
+                with the recursion (defaults to a lookup from the root)
             
         Returns:
-            Merged configuration
+            Merged configuration, sharing untouched subtrees with engnew
         """
-        result = copy.deepcopy(engnew)
+        # Path-copy: only this level is copied, keys left alone keep pointing
+        # at the ENGNEW subtree and nothing below is mutated in place
+        result = copy.copy(engnew)
         
         for key, diff_value in diff.items():
             current_path = f"{path}.{key}" if path else key
@@ -434,18 +541,19 @@ class ConfigMerger:
                 engnew_value = engnew[key]
                 
                 # Check if rulebook has a rule for this path
-                if rulebook and ConfigMerger._has_rulebook_rule(rulebook, current_path):
-                    strategy = rulebook.get_merge_strategy(current_path)
-                    
+                strategy = ConfigMerger._get_rulebook_strategy(rulebook, current_path)
+                if strategy is not None:
                     if strategy == "engnew":
                         # Keep ENGNEW value, ignore DIFF
                         continue
                     elif strategy == "nsprev":
                         # Use original NSPREV value
                         if original_nsprev:
-                            original_value = ConfigMerger._get_nested_value(original_nsprev, current_path)
+                            original_value = ConfigMerger._get_nsprev_child(
+                                nsprev_node, key, original_nsprev, current_path
+                            )
                             if original_value is not None:
-                                result[key] = copy.deepcopy(original_value)
+                                result[key] = _clone(original_value)
                             else:
                                 # Original NSPREV doesn't have this field, remove it
                                 if key in result:
@@ -468,8 +576,14 @@ class ConfigMerger:
                 # No rulebook rule - apply DIFF value (default overlay behavior)
                 if isinstance(engnew_value, dict) and isinstance(diff_value, dict):
                     # Recursively merge nested dictionaries
+                    child_node = _UNRESOLVED
+                    if original_nsprev:
+                        child_node = ConfigMerger._get_nsprev_child(
+                            nsprev_node, key, original_nsprev, current_path
+                        )
                     result[key] = ConfigMerger._merge_diff_with_rulebook(
-                        engnew_value, diff_value, original_nsprev, rulebook, current_path
+                        engnew_value, diff_value, original_nsprev, rulebook, current_path,
+                        child_node
                     )
                 elif isinstance(engnew_value, list) and isinstance(diff_value, list):
                     # Merge lists - use DIFF list but preserve ENGNEW fields that don't exist in DIFF
@@ -478,35 +592,39 @@ class ConfigMerger:
                     )
                 else:
                     # Override with DIFF value (including scalars)
-                    result[key] = copy.deepcopy(diff_value)
+                    result[key] = _clone(diff_value)
             else:
                 # Key doesn't exist in ENGNEW - add from DIFF
-                result[key] = copy.deepcopy(diff_value)
+                result[key] = _clone(diff_value)
         
         # Handle ENGNEW fields that don't exist in DIFF
         # These should be kept from ENGNEW (already in result since we start with ENGNEW)
-        # But check if there are any rulebook rules that might override them
-        if rulebook and original_nsprev:
+        # But check if there are any rulebook rules that might override them;
+        # only 'nsprev'/'merge' rules can, so skip the pass if none exist
+        if rulebook and original_nsprev and rulebook.uses_nsprev_values():
             for key, engnew_value in engnew.items():
                 if key not in diff:
                     current_path = f"{path}.{key}" if path else key
                     
                     # Check if rulebook has a rule for this path
-                    if ConfigMerger._has_rulebook_rule(rulebook, current_path):
-                        strategy = rulebook.get_merge_strategy(current_path)
-                        
+                    strategy = ConfigMerger._get_rulebook_strategy(rulebook, current_path)
+                    if strategy is not None:
                         if strategy == "nsprev":
                             # Use original NSPREV value
-                            original_value = ConfigMerger._get_nested_value(original_nsprev, current_path)
+                            original_value = ConfigMerger._get_nsprev_child(
+                                nsprev_node, key, original_nsprev, current_path
+                            )
                             if original_value is not None:
-                                result[key] = copy.deepcopy(original_value)
+                                result[key] = _clone(original_value)
                             else:
                                 # Original NSPREV doesn't have this field, remove it
                                 if key in result:
                                     del result[key]
                         elif strategy == "merge":
                             # Smart merge ENGNEW + original NSPREV
-                            original_value = ConfigMerger._get_nested_value(original_nsprev, current_path)
+                            original_value = ConfigMerger._get_nsprev_child(
+                                nsprev_node, key, original_nsprev, current_path
+                            )
                             if original_value is not None:
                                 if isinstance(engnew_value, dict) and isinstance(original_value, dict):
                                     result[key] = ConfigMerger._merge_dict_with_strategy(
@@ -524,6 +642,36 @@ class ConfigMerger:
         
         return result
 
+    @staticmethod
+    def _get_nsprev_child(
+        nsprev_node: Any,
+        key: Any,
+        original_nsprev: Dict[str, Any],
+        path: str
+    ) -> Any:
+        """
+        Get the original NSPREV value at path, one level below nsprev_node.
+        
+        Equivalent to _get_nested_value(original_nsprev, path) but takes a
+        single step from the parent value instead of walking from the root.
+        Keys that would split differently in a dotted path (non-strings,
+        empty keys or keys containing dots) fall back to the full lookup.
+        
+        Args:
+            nsprev_node: Original NSPREV value at the parent path, or _UNRESOLVED
+            key: Key of path below the parent
+            original_nsprev: Original NSPREV data
+            path: Full dot notation path of the child
+            
+        Returns:
+            Value at path or None if not found
+        """
+        if nsprev_node is _UNRESOLVED or not isinstance(key, str) or not key or '.' in key:
+            return ConfigMerger._get_nested_value(original_nsprev, path)
+        if isinstance(nsprev_node, dict):
+            return nsprev_node.get(key)
+        return None
+
     @staticmethod
     def _merge_list_with_diff_overlay(
         engnew_list: List[Any], 
@@ -560,14 +708,14 @@ class ConfigMerger:
                     result.append(merged_item)
                 else:
                     # Non-dict items - use DIFF value
-                    result.append(copy.deepcopy(diff_item))
+                    result.append(_clone(diff_item))
             else:
                 # DIFF has more items than ENGNEW - add from DIFF
-                result.append(copy.deepcopy(diff_item))
+                result.append(_clone(diff_item))
         
         # Add any remaining ENGNEW items that don't exist in DIFF
         for i in range(len(diff_list), len(engnew_list)):
-            result.append(copy.deepcopy(engnew_list[i]))
+            result.append(_clone(engnew_list[i]))
         
         return result
 
@@ -586,10 +734,9 @@ class ConfigMerger:
         if not path:
             return data
             
-        keys = path.split('.')
         current = data
         
-        for key in keys:
+        for key in _split_path(path):
             if isinstance(current, dict) and key in current:
                 current = current[key]
             else:
@@ -617,13 +764,13 @@ class ConfigMerger:
             Merged list
         """
         if strategy == "engnew":
-            return copy.deepcopy(engnew_list)
+            return _clone(engnew_list)
         elif strategy == "nsprev":
-            return copy.deepcopy(nsprev_list)
+            return _clone(nsprev_list)
         elif strategy == "merge":
             return ConfigMerger._smart_merge_list(engnew_list, nsprev_list)
         else:
-            return copy.deepcopy(engnew_list)
+            return _clone(engnew_list)
 
     @staticmethod
     def _smart_merge_list(engnew_list: List[Any], nsprev_list: List[Any]) -> List[Any]:
@@ -641,20 +788,37 @@ class ConfigMerger:
             return []
         
         if not engnew_list:
-            return copy.deepcopy(nsprev_list)
+            return _clone(nsprev_list)
         
         if not nsprev_list:
-            return copy.deepcopy(engnew_list)
+            return _clone(engnew_list)
         
         # Check if these are lists of dictionaries
         if (isinstance(engnew_list[0], dict) and isinstance(nsprev_list[0], dict)):
             return ConfigMerger._merge_list_of_dicts(engnew_list, nsprev_list)
         else:
-            # Simple lists - use ENGNEW as base, add unique NSPREV items
-            result = copy.deepcopy(engnew_list)
+            # Simple lists - use ENGNEW as base, add unique NSPREV items.
+            # Hashable items are tracked in a set; unhashable ones (nested
+            # dicts/lists) fall back to a linear equality scan.
+            result = _clone(engnew_list)
+            seen = set()
+            unhashable = []
+            for existing in result:
+                try:
+                    seen.add(existing)
+                except TypeError:
+                    unhashable.append(existing)
+
             for item in nsprev_list:
-                if item not in result:
-                    result.append(copy.deepcopy(item))
+                try:
+                    if item in seen:
+                        continue
+                    seen.add(item)
+                except TypeError:
+                    if item in unhashable:
+                        continue
+                    unhashable.append(item)
+                result.append(_clone(item))
             return result
 
     @staticmethod
@@ -669,22 +833,8 @@ class ConfigMerger:
         Returns:
             Merged list of dicts
         """
-        # Create lookup dictionaries
-        engnew_dict = {}
-        nsprev_dict = {}
-        
-        # Build lookups from lists
-        for item in engnew_list:
-            key = ConfigMerger._get_dict_key(item)
-            if key:
-                engnew_dict[key] = item
-        
-        for item in nsprev_list:
-            key = ConfigMerger._get_dict_key(item)
-            if key:
-                nsprev_dict[key] = item
-        
-        # Start with ENGNEW items
+        # Start with ENGNEW items, remembering their keys in a set so each
+        # NSPREV item is checked in O(1)
         result = []
         used_keys = set()
         
@@ -692,14 +842,14 @@ class ConfigMerger:
         for item in engnew_list:
             key = ConfigMerger._get_dict_key(item)
             if key:
-                result.append(copy.deepcopy(item))
+                result.append(_clone(item))
                 used_keys.add(key)
         
         # Add unique NSPREV items
         for item in nsprev_list:
             key = ConfigMerger._get_dict_key(item)
             if key and key not in used_keys:
-                result.append(copy.deepcopy(item))
+                result.append(_clone(item))
         
         return result
 
@@ -738,10 +888,8 @@ class ConfigMerger:
             return False
         
         # Check if this path has an explicit override
-        path_overrides = rulebook.rules.get('path_overrides', {})
-        for override_path in path_overrides:
-            if rulebook._path_matches(field_path, override_path):
-                return True
+        if rulebook.match_path_override(field_path) is not None:
+            return True
         
         # Check if field name matches a merge_rules entry
         field_name = field_path.split('.')[-1]
@@ -769,16 +917,26 @@ class ConfigMerger:
             Merged dictionary
         """
         if strategy == "engnew":
-            return copy.deepcopy(engnew_dict)
+            return _clone(engnew_dict)
         elif strategy == "nsprev":
-            return copy.deepcopy(nsprev_dict)
+            return _clone(nsprev_dict)
         elif strategy == "merge":
             # Merge both: ENGNEW base + NSPREV additions
-            result = copy.deepcopy(engnew_dict)
-            result.update(copy.deepcopy(nsprev_dict))
-            return result
+            if type(engnew_dict) is not dict:
+                # Copy the whole mapping to keep its type and comment metadata
+                result = _clone(engnew_dict)
+                for key, value in nsprev_dict.items():
+                    result[key] = _clone(value)
+                return result
+
+            # Let dict.update do the key merge in C (ENGNEW key order, NSPREV
+            # values win), then copy each surviving value once; ENGNEW values
+            # that NSPREV overrides are never copied
+            merged = dict(engnew_dict)
+            merged.update(nsprev_dict)
+            return {key: _clone(value) for key, value in merged.items()}
         else:
-            return copy.deepcopy(engnew_dict)
+            return _clone(engnew_dict)
 
     @staticmethod
     def _handle_structural_mismatch(
@@ -800,15 +958,15 @@ class ConfigMerger:
             Resolved value
         """
         if strategy == "engnew":
-            return copy.deepcopy(engnew_value)
+            return _clone(engnew_value)
         elif strategy == "nsprev":
-            return copy.deepcopy(nsprev_value)
+            return _clone(nsprev_value)
         elif strategy == "merge":
             # For structural mismatches, prefer NSPREV to preserve site-specific structure
             # This is a conservative approach to avoid breaking existing configurations
-            return copy.deepcopy(nsprev_value)
+            return _clone(nsprev_value)
         else:
-            return copy.deepcopy(nsprev_value)
+            return _clone(nsprev_value)
 
     @staticmethod
     def _apply_scalar_strategy(engnew_value: Any, nsprev_value: Any, strategy: str) -> Any:
@@ -824,14 +982,14 @@ class ConfigMerger:
             Merged value
         """
         if strategy == "engnew":
-            return copy.deepcopy(engnew_value)
+            return _clone(engnew_value)
         elif strategy == "nsprev":
-            return copy.deepcopy(nsprev_value)
+            return _clone(nsprev_value)
         elif strategy == "merge":
             # For scalars, NSPREV takes precedence
-            return copy.deepcopy(nsprev_value)
+            return _clone(nsprev_value)
         else:
-            return copy.deepcopy(engnew_value)
+            return _clone(engnew_value)
 
     @staticmethod
     def _is_list_of_dicts(value: List[Any]) -> bool:
@@ -865,9 +1023,9 @@ class ConfigMerger:
         for item in value:
             if isinstance(item, dict):
                 # Ensure dict items are properly formatted
-                normalized.append(copy.deepcopy(item))
+                normalized.append(_clone(item))
             else:
-                normalized.append(copy.deepcopy(item))
+                normalized.append(_clone(item))
 
         return normalized
 
@@ -893,8 +1051,6 @@ class ConfigMerger:
         Returns:
             Configuration with version references updated
         """
-        import re
-
         # Extract target version if not provided
         if not target_version:
             target_version = ConfigMerger._extract_target_version(config)
@@ -947,14 +1103,9 @@ class ConfigMerger:
         Returns:
             Old version pattern or None if not found
         """
-        import re
-
-        # Look for version patterns (X.Y.Z format)
-        version_pattern = re.compile(r'\b(\d+\.\d+\.\d+)\b')
-
-        # Collect all version strings found in the config
+        # Collect all version strings (X.Y.Z format) found in the config
         found_versions = set()
-        ConfigMerger._collect_version_strings(config, version_pattern, found_versions)
+        ConfigMerger._collect_version_strings(config, _VERSION_RE, found_versions)
 
         # Remove the target version from candidates
         found_versions.discard(target_version)
@@ -974,23 +1125,27 @@ class ConfigMerger:
         found_versions: set
     ) -> None:
         """
-        Recursively collect version strings from data structure.
+        Collect version strings from data structure.
+
+        Walks the structure with an explicit stack rather than recursion, so
+        no Python frame is created per nested node.
 
         Args:
             data: Data to search (dict, list, str, etc.)
             version_pattern: Compiled regex pattern for version detection
             found_versions: Set to collect found versions
         """
-        if isinstance(data, dict):
-            for value in data.values():
-                ConfigMerger._collect_version_strings(value, version_pattern, found_versions)
-        elif isinstance(data, list):
-            for item in data:
-                ConfigMerger._collect_version_strings(item, version_pattern, found_versions)
-        elif isinstance(data, str):
-            # Search for version patterns in string values
-            matches = version_pattern.findall(data)
-            found_versions.update(matches)
+        findall = version_pattern.findall
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, str):
+                # Search for version patterns in string values
+                found_versions.update(findall(node))
 
     @staticmethod
     def _replace_version_recursive(
@@ -1019,6 +1174,9 @@ class ConfigMerger:
         elif isinstance(data, str):
             # Replace exact matches of the old version with new version
             return data.replace(old_version, new_version)
+        elif data is None or isinstance(data, (int, float)):
+            # Immutable scalars (including bool) can be shared, not copied
+            return data
         else:
-            # Return unchanged for other types (int, bool, None, etc.)
-            return copy.deepcopy(data)
+            # Return unchanged for other types (dates, custom YAML types, etc.)
+            return _clone(data)
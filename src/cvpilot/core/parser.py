@@ -4,17 +4,78 @@ YAML file parser with validation.
 Handles loading and basic syntax validation of YAML files.
 """
 
-from pathlib import Path
-from typing import Any, Dict, Optional
+import copy
+import importlib.util
+import io
+import os
+import warnings
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from ruamel.yaml import YAML
+# Documents parsed during validation are kept for at most this many files
+_MAX_VALIDATED_DOCUMENTS = 8
+
+# Parsed documents kept by a parser created with enable_cache=True
+_MAX_CACHED_DOCUMENTS = 32
+
+# Setting this environment variable to "1" makes parsers that were not given
+# enable_cache explicitly share one process-wide cache (used by the test suite)
+CACHE_ENV_VAR = "CVPILOT_YAML_CACHE"
+
+# Process-wide caches for CACHE_ENV_VAR, keyed by format_preserving_load so
+# round-trip and plain documents are never mixed
+_shared_caches: "Dict[bool, OrderedDict[str, Tuple[int, int, Any]]]" = {}
+
+
+@lru_cache(maxsize=None)
+def _libyaml_available() -> bool:
+    """
+    Check for ruamel's libyaml C extension, warning once if it is missing.
+
+    Without it the safe loader silently falls back to the pure-Python
+    scanner, which is several times slower on large files.
+
+    Returns:
+        True if the C parser can be used
+    """
+    # The warning is about the environment rather than any one caller, so it
+    # is attributed to this module
+    if importlib.util.find_spec("_ruamel_yaml") is None:
+        warnings.warn(
+            "ruamel.yaml.clib (libyaml) is not installed; YAML files will be "
+            "loaded with the much slower pure-Python parser",
+            RuntimeWarning,
+        )
+        return False
+    return True
 
 
 class YAMLParser:
     """Simple YAML parser with error handling using ruamel.yaml."""
 
-    def __init__(self):
-        """Initialize ruamel.yaml instance with proper settings."""
+    def __init__(
+        self, enable_cache: Optional[bool] = None, format_preserving_load: bool = True
+    ):
+        """
+        Initialize ruamel.yaml instance with proper settings.
+
+        Args:
+            enable_cache: Keep parsed documents keyed by path, mtime and size,
+                so loading an unchanged file again returns a copy instead of
+                parsing it. Off by default; when left as None, setting the
+                CVPILOT_YAML_CACHE environment variable to "1" turns on a
+                cache shared by all such parsers.
+            format_preserving_load: Load files in round-trip mode, keeping
+                quotes and comments. When False, load_yaml_file returns plain
+                dicts and lists from the safe loader (libyaml-backed when
+                ruamel.yaml.clib is installed), which is much faster.
+                Saving always uses round-trip mode.
+        """
+        # Imported here so commands that never parse YAML (--help, usage
+        # errors) do not pay for loading ruamel.yaml
+        from ruamel.yaml import YAML
+
         self.yaml = YAML()
         self.yaml.preserve_quotes = True
         self.yaml.width = 1000
@@ -22,6 +83,22 @@ class YAMLParser:
         # Enable comment preservation
         self.yaml.preserve_quotes = True
         self.yaml.width = 1000
+        # Instance used to read files; only the round-trip one writes them
+        if format_preserving_load:
+            self._loader = self.yaml
+        else:
+            self._loader = YAML(typ="safe", pure=False)
+            _libyaml_available()
+        # Absolute path -> (mtime_ns, size, document) parsed by validate_yaml_syntax
+        # and handed to the next load_yaml_file call for the unchanged file
+        self._validated: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+        # Absolute path -> (mtime_ns, size, document) for every parsed file,
+        # least recently used first; None when caching is disabled
+        self._cache: "Optional[OrderedDict[str, Tuple[int, int, Any]]]" = None
+        if enable_cache:
+            self._cache = OrderedDict()
+        elif enable_cache is None and os.environ.get(CACHE_ENV_VAR) == "1":
+            self._cache = _shared_caches.setdefault(format_preserving_load, OrderedDict())
 
     def load_yaml_file(self, file_path: str) -> Dict[str, Any]:
         """
@@ -37,9 +114,108 @@ class YAMLParser:
             FileNotFoundError: If file doesn't exist
             ValueError: If YAML syntax is invalid
         """
+        # Reuse the document parsed while validating, if the file is unchanged.
+        # The entry is removed so the caller owns it and no copy is needed.
+        entry = self._validated.pop(os.path.abspath(file_path), None)
+        if entry is not None:
+            mtime_ns, size, data = entry
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                stat = None
+            if stat is not None and (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size):
+                return data
+
+        if self._cache is None:
+            return self._parse_yaml_file(file_path)
+        return self._load_cached(file_path)
+
+    def load_yaml_files(self, file_paths: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Load several YAML files with this parser, in order.
+
+        One configured parser serves every file, and documents already parsed
+        by validate_all_files are handed over without parsing them again.
+        Files are loaded one after another: the ruamel.yaml instance is not
+        safe to share between threads.
+
+        Args:
+            file_paths: Paths to the YAML files
+
+        Returns:
+            Parsed documents, in the same order as file_paths
+
+        Raises:
+            FileNotFoundError: If a file doesn't exist
+            ValueError: If a file's YAML syntax is invalid
+        """
+        load = self.load_yaml_file
+        return [load(file_path) for file_path in file_paths]
+
+    def _load_cached(self, file_path: str, copy_result: bool = True) -> Dict[str, Any]:
+        """
+        Load a YAML file through the parsed-document cache.
+
+        Args:
+            file_path: Path to the YAML file
+            copy_result: Return a copy; pass False only to check or warm the cache
+
+        Returns:
+            A copy of the cached document, which the caller may modify
+            (the cached document itself if copy_result is False)
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If YAML syntax is invalid
+        """
+        cache = self._cache
+        # Only called when caching is enabled
+        assert cache is not None
+        key = os.path.abspath(file_path)
         try:
-            with open(file_path, encoding="utf-8") as file:
-                data = self.yaml.load(file)
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            cache.pop(key, None)
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        entry = cache.get(key)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            cache.move_to_end(key)
+            return copy.deepcopy(entry[2]) if copy_result else entry[2]
+
+        # Stat before parsing, so a file edited in between is never reused
+        data = self._parse_yaml_file(file_path)
+        cache[key] = (stat.st_mtime_ns, stat.st_size, data)
+        cache.move_to_end(key)
+        if len(cache) > _MAX_CACHED_DOCUMENTS:
+            cache.popitem(last=False)
+        return copy.deepcopy(data) if copy_result else data
+
+    def reset_caches(self) -> None:
+        """Drop all parsed documents kept by this parser."""
+        self._validated.clear()
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _parse_yaml_file(self, file_path: str) -> Dict[str, Any]:
+        """
+        Parse a YAML file from disk.
+
+        Args:
+            file_path: Path to the YAML file
+
+        Returns:
+            Parsed YAML data as dictionary
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If YAML syntax is invalid
+        """
+        try:
+            # Hand ruamel the raw bytes; its reader detects the encoding
+            # (UTF-8 unless a BOM says otherwise) and decodes as it scans
+            with open(file_path, "rb") as file:
+                data = self._loader.load(file)
                 if data is None:
                     return {}
                 return data
@@ -55,14 +231,43 @@ class YAMLParser:
         Args:
             file_path: Path to the YAML file
 
+        The parsed document is kept so that a following load_yaml_file call
+        for the same, unchanged file does not parse it again.
+
         Returns:
             True if YAML syntax is valid, False otherwise
         """
         try:
-            self.load_yaml_file(file_path)
-            return True
-        except (ValueError, FileNotFoundError):
+            self._parse_and_keep(file_path)
+        except (ValueError, OSError):
             return False
+        return True
+
+    def _parse_and_keep(self, file_path: str) -> None:
+        """
+        Parse a YAML file and keep the document for the next load_yaml_file call.
+
+        Args:
+            file_path: Path to the YAML file
+
+        Raises:
+            OSError: If the file cannot be stat'ed (FileNotFoundError if missing)
+            ValueError: If YAML syntax is invalid
+        """
+        if self._cache is not None:
+            # The cache already holds the document for the next load
+            self._load_cached(file_path, copy_result=False)
+            return
+
+        # Stat before parsing, so a file edited in between is never reused
+        stat = os.stat(file_path)
+        data = self._parse_yaml_file(file_path)
+
+        key = os.path.abspath(file_path)
+        self._validated.pop(key, None)
+        self._validated[key] = (stat.st_mtime_ns, stat.st_size, data)
+        if len(self._validated) > _MAX_VALIDATED_DOCUMENTS:
+            self._validated.popitem(last=False)
 
     def save_yaml_file(self, data: Dict[str, Any], file_path: str) -> None:
         """
@@ -75,8 +280,7 @@ class YAMLParser:
         try:
             # Normalize data to fix annotations formatting issues
             normalized_data = self._normalize_annotations_lists(data)
-            with open(file_path, "w", encoding="utf-8") as file:
-                self.yaml.dump(normalized_data, file)
+            self._dump_to_file(normalized_data, file_path)
         except Exception as e:
             raise ValueError(f"Error writing to {file_path}: {e}")
     
@@ -91,7 +295,7 @@ class YAMLParser:
             ruamel.yaml CommentedMap with preserved comments
         """
         try:
-            with open(file_path, encoding="utf-8") as file:
+            with open(file_path, "rb") as file:
                 return self.yaml.load(file)
         except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {file_path}")
@@ -107,11 +311,26 @@ class YAMLParser:
             file_path: Output file path
         """
         try:
-            with open(file_path, "w", encoding="utf-8") as file:
-                self.yaml.dump(data, file)
+            self._dump_to_file(data, file_path)
         except Exception as e:
             raise ValueError(f"Error writing to {file_path}: {e}")
 
+    def _dump_to_file(self, data: Any, file_path: str) -> None:
+        """
+        Dump data as YAML and write it to a file in one call.
+
+        The emitter writes token by token; rendering into memory first keeps
+        those many small writes off the file object.
+
+        Args:
+            data: Data to dump
+            file_path: Output file path
+        """
+        buffer = io.StringIO()
+        self.yaml.dump(data, buffer)
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write(buffer.getvalue())
+
     def validate_all_files(self, file_paths: list[str]) -> tuple[bool, Optional[str]]:
         """
         Validate syntax of all input files.
@@ -123,15 +342,20 @@ class YAMLParser:
             Tuple of (all_valid, error_message)
         """
         for file_path in file_paths:
-            if not Path(file_path).exists():
+            # Validate straight away and tell a missing file apart by the
+            # error, rather than stat'ing it once more up front. As with
+            # Path.exists(), a path that cannot be stat'ed at all (missing,
+            # symlink loop, over-long name, ...) counts as not found.
+            try:
+                self._parse_and_keep(file_path)
+            except OSError:
                 return False, f"File not found: {file_path}"
-
-            if not self.validate_yaml_syntax(file_path):
+            except ValueError:
                 return False, f"Invalid YAML syntax in: {file_path}"
 
         return True, None
 
-    def _normalize_annotations_lists(self, data):
+    def _normalize_annotations_lists(self, data: Any) -> Any:
         """
         Normalize annotations lists to ensure proper YAML formatting.
 
@@ -182,3 +406,28 @@ class YAMLParser:
                 normalized.append(item)
 
         return normalized
+
+
+# Shared parsers, keyed by their format_preserving_load setting
+_default_parsers: Dict[bool, YAMLParser] = {}
+
+
+def get_default_parser(format_preserving_load: bool = True) -> YAMLParser:
+    """
+    Get the shared YAMLParser, creating it on first use.
+
+    The ruamel.yaml settings are fixed in __init__ and never changed, so one
+    configured instance can serve every caller that has no parser of its own.
+
+    Args:
+        format_preserving_load: Whether the parser loads in round-trip mode
+
+    Returns:
+        The process-wide YAMLParser instance for that load mode
+    """
+    parser = _default_parsers.get(format_preserving_load)
+    if parser is None:
+        parser = _default_parsers[format_preserving_load] = YAMLParser(
+            format_preserving_load=format_preserving_load
+        )
+    return parser
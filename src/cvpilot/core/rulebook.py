@@ -4,14 +4,69 @@ Rulebook management for merge strategies.
 Handles loading, parsing, validating, and querying merge rules from YAML configuration.
 """
 
+import copy
+import os
 import yaml
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Pattern, Set, Tuple, Union
 import re
 
+# Stands in for wildcard patterns that do not form a valid regex
+_NEVER_MATCH = re.compile(r'(?!)')
+
+# libyaml-backed loader/dumper when PyYAML was built with it. The dumper is
+# the full one, not the safe one, so output matches plain yaml.dump.
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, 'CDumper', yaml.Dumper)
+
+
+@lru_cache(maxsize=8)
+def _parse_rulebook_file(path: str, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a rulebook file, caching the result per file version.
+
+    The modification time and size are part of the cache key so an edited
+    rulebook is parsed again. Callers must copy the result before mutating it.
+
+    Args:
+        path: Resolved path to the rulebook YAML file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+
+    Returns:
+        Parsed YAML document
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+def _load_rulebook_file(path: str) -> Tuple[Any, Tuple[str, int, int]]:
+    """
+    Load a rulebook file through the parse cache.
+
+    Args:
+        path: Path to the rulebook YAML file
+
+    Returns:
+        Tuple of (private copy of the parsed YAML document, file version key)
+    """
+    resolved = os.path.realpath(path)
+    stat = os.stat(resolved)
+    version = (resolved, stat.st_mtime_ns, stat.st_size)
+    return copy.deepcopy(_parse_rulebook_file(*version)), version
+
+
+# (manager class, file version) pairs whose parsed rulebook already passed
+# _validate_rulebook; an unchanged file parses to the same document, so it is
+# not validated again
+_validated_rulebooks: Set[Tuple[type, Tuple[str, int, int]]] = set()
+
 
 class RulebookManager:
     """Manages merge rule configuration and path matching."""
+
+    VALID_STRATEGIES = frozenset({'engnew', 'nsprev', 'merge'})
+    VALID_SCOPES = frozenset({'global', 'specific'})
     
     def __init__(self, rulebook_path: Optional[str] = None):
         """
@@ -21,12 +76,35 @@ class RulebookManager:
             rulebook_path: Path to rulebook YAML file
         """
         self.rulebook_path = rulebook_path
-        self.rules = {}
+        self._rules: Dict[str, Any] = {}  # Set through the rules property
         self.path_cache = {}  # Cache for path matching results
+        self.explicit_rule_cache: Dict[str, Optional[str]] = {}  # Cache for get_explicit_strategy
+        self.pattern_cache: Dict[str, Optional[Pattern]] = {}  # Compiled wildcard patterns
+        self._override_paths: List[str] = []  # path_overrides keys, in rulebook order
+        self._override_strategies: List[Optional[str]] = []  # Strategy per override key
+        self._override_regex: Optional[Pattern] = None  # Union of all path_overrides
+        # (lowered name, strategy) per global rule, in rulebook order; built
+        # from self.rules on first use together with the specific-rule union
+        self._specific_regex: Optional[Pattern] = None  # Union of all specific rule paths
+        self._specific_strategies: List[str] = []  # Strategy per specific rule path
+        self._global_rules: Optional[List[Tuple[str, str]]] = None
+        self._uses_nsprev_values: Optional[bool] = None
         
         if rulebook_path:
             self.load_rulebook(rulebook_path)
     
+    @property
+    def rules(self) -> Dict[str, Any]:
+        """Rulebook dictionary the lookups are answered from."""
+        return self._rules
+    
+    @rules.setter
+    def rules(self, rules: Dict[str, Any]) -> None:
+        # Every memoised lookup and rule index derives from the rules, so
+        # assigning a new rulebook drops them
+        self._rules = rules
+        self.reset_caches()
+    
     def load_rulebook(self, path: str) -> Dict[str, Any]:
         """
         Load and parse rulebook from YAML file.
@@ -38,11 +116,17 @@ class RulebookManager:
             Loaded rulebook dictionary
         """
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                self.rules = yaml.safe_load(f) or {}
+            rules, version = _load_rulebook_file(path)
+            self.rules = rules or {}
             
-            # Validate the rulebook structure
-            self._validate_rulebook(self.rules)
+            # Validate the rulebook structure, once per file version
+            validated_key = (type(self), version)
+            if validated_key not in _validated_rulebooks:
+                self._validate_rulebook(self.rules)
+                _validated_rulebooks.add(validated_key)
+            
+            # Compile every rule-derived pattern once, up front
+            self._compile_rule_patterns()
             
             return self.rules
         except FileNotFoundError:
@@ -75,35 +159,33 @@ class RulebookManager:
         strategy = None
         
         # 1. Check path_overrides (highest priority)
-        path_overrides = self.rules.get('path_overrides', {})
-        for override_path, override_config in path_overrides.items():
-            if self._path_matches(field_path, override_path):
-                strategy = override_config.get('strategy')
-                break
+        override_index = self._match_override_index(field_path)
+        if override_index is not None:
+            strategy = self._override_strategies[override_index]
+        
+        global_rules = self._global_rules
+        if global_rules is None:
+            global_rules = self._index_merge_rules()
         
         # 2. Check merge_rules with specific scope
         if not strategy:
-            merge_rules = self.rules.get('merge_rules', {})
-            for rule_name, rule_config in merge_rules.items():
-                if rule_config.get('scope') == 'specific':
-                    paths = rule_config.get('paths', [])
-                    if any(self._path_matches(field_path, path) for path in paths):
-                        strategy = rule_config.get('strategy')
-                        break
+            # Built by _index_merge_rules together with the global rules
+            specific_regex = self._specific_regex
+            assert specific_regex is not None
+            match = specific_regex.match(field_path)
+            if match is not None and match.lastgroup is not None:
+                strategy = self._specific_strategies[int(match.lastgroup[1:])]
         
         # 3. Check merge_rules with global scope
         if not strategy:
             field_name = field_path.split('.')[-1].lower()
-            merge_rules = self.rules.get('merge_rules', {})
             
-            for rule_name, rule_config in merge_rules.items():
-                if rule_config.get('scope') == 'global':
-                    # Check if field name matches rule name
-                    if (rule_name.lower() in field_name or 
-                        field_name in rule_name.lower() or
-                        self._field_name_matches(field_name, rule_name)):
-                        strategy = rule_config.get('strategy')
-                        break
+            for rule_name, rule_strategy in global_rules:
+                # Check if field name matches rule name. Containment either way
+                # also covers singular/plural variations of the two names.
+                if rule_name in field_name or field_name in rule_name:
+                    strategy = rule_strategy
+                    break
         
         # 4. Use default strategy
         if not strategy:
@@ -129,54 +211,240 @@ class RulebookManager:
         Returns:
             True if path matches pattern
         """
-        # Handle wildcard patterns
-        if '*' in pattern:
-            # Convert pattern to regex
-            regex_pattern = pattern.replace('[*]', r'\[\d+\]')  # Array wildcard
-            regex_pattern = regex_pattern.replace('*', r'[^.]+')  # Field wildcard
-            regex_pattern = f"^{regex_pattern}$"
+        compiled = self._compile_pattern(pattern)
+        if compiled is None:
+            # Exact match
+            return field_path == pattern
+        
+        return compiled.match(field_path) is not None
+    
+    def has_rules(self) -> bool:
+        """
+        Check if the rulebook defines any path overrides or merge rules.
+        
+        Returns:
+            True if at least one explicit rule is defined
+        """
+        return bool(self.rules.get('path_overrides') or self.rules.get('merge_rules'))
+    
+    def uses_nsprev_values(self) -> bool:
+        """
+        Check if any rule can resolve to a strategy that reads NSPREV values.
+        
+        When every override, merge rule and the default resolve to 'engnew',
+        fields missing from the diff can never be restored from NSPREV.
+        
+        Returns:
+            True if some rule (or the default) uses 'nsprev' or 'merge'
+        """
+        if self._uses_nsprev_values is None:
+            strategies = {self.rules.get('default_strategy', 'engnew')}
+            for section in ('path_overrides', 'merge_rules'):
+                for rule_config in self.rules.get(section, {}).values():
+                    strategies.add(rule_config.get('strategy'))
+            self._uses_nsprev_values = not strategies.isdisjoint(('nsprev', 'merge'))
+        
+        return self._uses_nsprev_values
+    
+    def has_explicit_rule(self, field_path: str) -> bool:
+        """
+        Check if a field path has an explicit rule (not just the default strategy).
+        
+        A path has an explicit rule when a path override matches it or when a
+        global merge rule is named exactly after its last segment.
+        
+        Args:
+            field_path: Path to check
             
-            try:
-                return bool(re.match(regex_pattern, field_path))
-            except re.error:
-                return False
+        Returns:
+            True if the path is covered by an explicit rule
+        """
+        return self.get_explicit_strategy(field_path) is not None
+    
+    def get_explicit_strategy(self, field_path: str) -> Optional[str]:
+        """
+        Resolve the merge strategy for a field path only if it has an explicit rule.
+        
+        Fuses has_explicit_rule and get_merge_strategy into one memoised
+        lookup; a matching path override answers both at once.
+        
+        Args:
+            field_path: Path to check
+            
+        Returns:
+            Merge strategy, or None if the path has no explicit rule
+        """
+        try:
+            return self.explicit_rule_cache[field_path]
+        except KeyError:
+            pass
+        
+        strategy = None
+        override_index = self._match_override_index(field_path)
+        if override_index is not None:
+            strategy = self._override_strategies[override_index]
+        
+        if not strategy:
+            explicit = override_index is not None
+            if not explicit:
+                field_name = field_path.split('.')[-1]
+                for rule_name, rule_config in self.rules.get('merge_rules', {}).items():
+                    if rule_config.get('scope') == 'global' and rule_name == field_name:
+                        explicit = True
+                        break
+            if explicit:
+                strategy = self.get_merge_strategy(field_path)
+        
+        self.explicit_rule_cache[field_path] = strategy
+        return strategy
+    
+    def _index_merge_rules(self) -> List[Tuple[str, str]]:
+        """
+        Split merge_rules by scope once, lower-casing global rule names.
+        
+        The paths of all specific rules are fused into one alternation regex,
+        in rulebook order, with one named group per path.
+        
+        Returns:
+            (lowered name, strategy) per global rule, as stored in _global_rules
+        """
+        specific_paths = []
+        self._specific_strategies = []
+        global_rules: List[Tuple[str, str]] = []
+        for rule_name, rule_config in self.rules.get('merge_rules', {}).items():
+            scope = rule_config.get('scope')
+            if scope == 'specific':
+                for path in rule_config.get('paths', []):
+                    specific_paths.append(path)
+                    self._specific_strategies.append(rule_config.get('strategy'))
+            elif scope == 'global':
+                global_rules.append((rule_name.lower(), rule_config.get('strategy')))
+        
+        self._specific_regex = self._build_union_regex(specific_paths, 's')
+        self._global_rules = global_rules
+        return global_rules
+    
+    def reset_caches(self) -> None:
+        """Drop all cached lookups derived from the current rules."""
+        self.path_cache.clear()
+        self.explicit_rule_cache.clear()
+        self._override_regex = None
+        self._specific_regex = None
+        self._global_rules = None
+        self._uses_nsprev_values = None
+    
+    def match_path_override(self, field_path: str) -> Optional[str]:
+        """
+        Find the first path override, in rulebook order, matching a field path.
+        
+        All overrides are tested in one pass by a single alternation regex
+        with one named group per override.
         
-        # Exact match
-        return field_path == pattern
+        Args:
+            field_path: Path to check
+            
+        Returns:
+            The matching path_overrides key, or None if no override matches
+        """
+        index = self._match_override_index(field_path)
+        if index is None:
+            return None
+        return self._override_paths[index]
     
-    def _field_name_matches(self, field_name: str, rule_name: str) -> bool:
+    def _match_override_index(self, field_path: str) -> Optional[int]:
         """
-        Check if a field name matches a rule name with fuzzy matching.
+        Find the position of the first path override matching a field path.
+        
+        Override keys and strategies are kept in parallel lists, so callers
+        that only need the strategy never go back to the rules dict.
         
         Args:
-            field_name: Name of the field
-            rule_name: Name of the rule
+            field_path: Path to check
             
         Returns:
-            True if names match
+            Index into _override_paths/_override_strategies, or None
+        """
+        override_regex = self._override_regex
+        if override_regex is None:
+            path_overrides = self.rules.get('path_overrides', {})
+            self._override_paths = list(path_overrides)
+            self._override_strategies = [
+                override_config.get('strategy') for override_config in path_overrides.values()
+            ]
+            override_regex = self._build_union_regex(self._override_paths, 'o')
+            self._override_regex = override_regex
+        
+        match = override_regex.match(field_path)
+        if match is None or match.lastgroup is None:
+            return None
+        return int(match.lastgroup[1:])
+    
+    def _build_union_regex(self, patterns: List[str], prefix: str) -> Pattern:
         """
-        # Direct match
-        if field_name == rule_name:
-            return True
+        Fuse path patterns into one alternation regex.
         
-        # Check if rule name is contained in field name
-        if rule_name.lower() in field_name.lower():
-            return True
+        Each pattern becomes a named group '<prefix><index>', so the index of
+        the first matching pattern is int(match.lastgroup[len(prefix):]).
         
-        # Check if field name is contained in rule name
-        if field_name.lower() in rule_name.lower():
-            return True
+        Args:
+            patterns: Path patterns, in priority order
+            prefix: Single-letter group name prefix
+            
+        Returns:
+            Compiled alternation regex (never matches if patterns is empty)
+        """
+        alternatives = []
+        for index, pattern in enumerate(patterns):
+            compiled = self._compile_pattern(pattern)
+            if compiled is None:
+                body = re.escape(pattern) + r'\Z'
+            elif compiled is _NEVER_MATCH:
+                continue
+            else:
+                body = compiled.pattern[1:]  # Drop the leading '^'
+            alternatives.append(f"(?P<{prefix}{index}>{body})")
+        
+        if alternatives:
+            return re.compile('^(?:' + '|'.join(alternatives) + ')')
+        return _NEVER_MATCH
+    
+    def _compile_pattern(self, pattern: str) -> Optional[Pattern]:
+        """
+        Get the compiled regex for a path pattern, compiling it on first use.
         
-        # Check for common variations
-        field_variations = [field_name, field_name + 's', field_name[:-1] if field_name.endswith('s') else field_name]
-        rule_variations = [rule_name, rule_name + 's', rule_name[:-1] if rule_name.endswith('s') else rule_name]
+        Args:
+            pattern: Path pattern, optionally containing wildcards
+            
+        Returns:
+            Compiled regex, or None if the pattern is matched exactly
+        """
+        try:
+            return self.pattern_cache[pattern]
+        except KeyError:
+            pass
         
-        for field_var in field_variations:
-            for rule_var in rule_variations:
-                if field_var.lower() == rule_var.lower():
-                    return True
+        compiled = None
+        if '*' in pattern:
+            # Convert pattern to regex
+            regex_pattern = pattern.replace('[*]', r'\[\d+\]')  # Array wildcard
+            regex_pattern = regex_pattern.replace('*', r'[^.]+')  # Field wildcard
+            try:
+                compiled = re.compile(f"^{regex_pattern}$")
+            except re.error:
+                compiled = _NEVER_MATCH
         
-        return False
+        self.pattern_cache[pattern] = compiled
+        return compiled
+    
+    def _compile_rule_patterns(self) -> None:
+        """Compile the patterns of all path overrides and specific-scope rules."""
+        for override_path in self.rules.get('path_overrides', {}):
+            self._compile_pattern(override_path)
+        
+        for rule_config in self.rules.get('merge_rules', {}).values():
+            if rule_config.get('scope') == 'specific':
+                for path in rule_config.get('paths', []):
+                    self._compile_pattern(path)
     
     def _validate_rulebook(self, rules: Dict[str, Any]) -> None:
         """
@@ -193,7 +461,7 @@ class RulebookManager:
         
         # Validate default_strategy
         default_strategy = rules.get('default_strategy', 'engnew')
-        if default_strategy not in ['engnew', 'nsprev', 'merge']:
+        if not self._is_valid_choice(default_strategy, self.VALID_STRATEGIES):
             raise ValueError(f"Invalid default_strategy: {default_strategy}")
         
         # Validate merge_rules
@@ -206,11 +474,11 @@ class RulebookManager:
                 raise ValueError(f"Rule '{rule_name}' must be a dictionary")
             
             strategy = rule_config.get('strategy')
-            if strategy not in ['engnew', 'nsprev', 'merge']:
+            if not self._is_valid_choice(strategy, self.VALID_STRATEGIES):
                 raise ValueError(f"Invalid strategy for rule '{rule_name}': {strategy}")
             
             scope = rule_config.get('scope')
-            if scope not in ['global', 'specific']:
+            if not self._is_valid_choice(scope, self.VALID_SCOPES):
                 raise ValueError(f"Invalid scope for rule '{rule_name}': {scope}")
             
             if scope == 'specific':
@@ -228,9 +496,24 @@ class RulebookManager:
                 raise ValueError(f"Override for path '{path}' must be a dictionary")
             
             strategy = override_config.get('strategy')
-            if strategy not in ['engnew', 'nsprev', 'merge']:
+            if not self._is_valid_choice(strategy, self.VALID_STRATEGIES):
                 raise ValueError(f"Invalid strategy for path override '{path}': {strategy}")
     
+    @staticmethod
+    def _is_valid_choice(value: Any, choices: frozenset) -> bool:
+        """
+        Check a rulebook value against a set of allowed strings.
+
+        Args:
+            value: Value read from the rulebook (may be any YAML type)
+            choices: Allowed values
+
+        Returns:
+            True if value is one of the allowed strings
+        """
+        # Unhashable YAML values (lists, maps) are simply invalid
+        return isinstance(value, str) and value in choices
+    
     def create_default_rulebook(self) -> Dict[str, Any]:
         """
         Create a default rulebook template.
@@ -273,7 +556,7 @@ class RulebookManager:
             output_path: Path to save the rulebook
         """
         with open(output_path, 'w', encoding='utf-8') as f:
-            yaml.dump(self.rules, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(self.rules, f, Dumper=_YAML_DUMPER, default_flow_style=False, sort_keys=False)
     
     def add_path_override(self, path: str, strategy: str) -> None:
         """
@@ -287,10 +570,10 @@ class RulebookManager:
             self.rules['path_overrides'] = {}
         
         self.rules['path_overrides'][path] = {'strategy': strategy}
+        self._compile_pattern(path)
         
-        # Clear cache for this path
-        if path in self.path_cache:
-            del self.path_cache[path]
+        # A wildcard override can change the result for any cached path
+        self.reset_caches()
     
     def get_rule_summary(self) -> Dict[str, Any]:
         """
@@ -302,10 +585,20 @@ class RulebookManager:
         merge_rules = self.rules.get('merge_rules', {})
         path_overrides = self.rules.get('path_overrides', {})
         
+        # Count both scopes in a single pass over the rules
+        global_rules = 0
+        specific_rules = 0
+        for rule_config in merge_rules.values():
+            scope = rule_config.get('scope')
+            if scope == 'global':
+                global_rules += 1
+            elif scope == 'specific':
+                specific_rules += 1
+        
         return {
             'default_strategy': self.rules.get('default_strategy', 'engnew'),
-            'global_rules': len([r for r in merge_rules.values() if r.get('scope') == 'global']),
-            'specific_rules': len([r for r in merge_rules.values() if r.get('scope') == 'specific']),
+            'global_rules': global_rules,
+            'specific_rules': specific_rules,
             'path_overrides': len(path_overrides),
             'total_rules': len(merge_rules) + len(path_overrides)
         }
@@ -7,13 +7,48 @@ provides interactive resolution.
 """
 
 import copy
-from typing import Any, Dict, List, Optional
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 from collections import defaultdict
 
+_INDEXED_KEY_RE = re.compile(r'([^\[]+)\[(\d+)\]')
+
+
+@lru_cache(maxsize=4096)
+def _path_segments(path: str) -> Tuple[Any, ...]:
+    """
+    Parse a path string into key and index segments, caching the result per path.
+
+    Args:
+        path: Path string (e.g., "api.list[0].name")
+
+    Returns:
+        Tuple of segments (strings for keys, ints for indices)
+    """
+    segments = []
+    
+    # Split on dots, but handle array indices
+    for part in path.split('.'):
+        # Check if part contains array index
+        match = _INDEXED_KEY_RE.match(part)
+        if match:
+            # Part with array index: "list[0]"
+            segments.append(match.group(1))  # key
+            segments.append(int(match.group(2)))  # index
+        else:
+            # Simple key
+            segments.append(part)
+    
+    return tuple(segments)
+
 
 class TransformationRecord:
     """Represents a detected path transformation."""
-    
+
+    # One record is created per duplicate path, so skip the per-instance __dict__
+    __slots__ = ('old_path', 'new_path', 'value', 'recommendation', 'reason', 'confidence')
+
     def __init__(
         self,
         old_path: str,
@@ -63,6 +98,19 @@ class PathTransformationDetector:
         """Initialize the detector."""
         self.path_value_map: Dict[str, Any] = {}
         self.value_paths_map: Dict[str, List[str]] = defaultdict(list)
+        # Flat index of every path in the reference of the current detection run
+        self._reference_config: Optional[Dict[str, Any]] = None
+        self._reference_index: Set[Tuple[Any, ...]] = set()
+    
+    def clear_reference_index(self) -> None:
+        """
+        Forget the cached reference path index.
+        
+        Call this after mutating a reference config that was already passed
+        to detect_duplicate_values, so the next run re-indexes it.
+        """
+        self._reference_config = None
+        self._reference_index = set()
     
     def detect_duplicate_values(
         self,
@@ -79,23 +127,26 @@ class PathTransformationDetector:
         Returns:
             List of detected transformation records
         """
+        # Index the reference once; every existence check below is a set
+        # lookup. The index is kept for later runs against the same object.
+        if reference_config is not self._reference_config:
+            self._reference_config = reference_config
+            self._reference_index = self._build_path_index(reference_config)
+        
         # Build path-value mappings
         self._build_path_value_map(merged_config, "")
         
-        # Find duplicate values across different paths
-        duplicate_groups = self._find_duplicate_value_groups()
-        
-        # Generate transformation records
+        # Generate transformation records, streaming over the duplicate
+        # value groups rather than materialising them first
         transformations = []
-        for value_key, paths in duplicate_groups.items():
-            if len(paths) >= 2:
-                # Compare against reference to determine correct structure
-                records = self._analyze_duplicate_paths(
-                    paths, 
-                    self.path_value_map,
-                    reference_config
-                )
-                transformations.extend(records)
+        for value_key, paths in self._iter_duplicate_value_groups():
+            # Compare against reference to determine correct structure
+            records = self._analyze_duplicate_paths(
+                paths, 
+                self.path_value_map,
+                reference_config
+            )
+            transformations.extend(records)
         
         # Detect parent object transformations
         parent_transformations = self._detect_parent_object_transformations(
@@ -123,43 +174,75 @@ class PathTransformationDetector:
         parent_key: str = ""
     ) -> None:
         """
-        Recursively build mapping of paths to values.
+        Build mapping of paths to values.
+        
+        Walks the structure depth-first with an explicit stack of child
+        iterators, visiting leaves in the same order as a recursive walk.
         
         Args:
             data: Current data node
             current_path: Current path in dot notation
             parent_key: Parent key name for context
         """
-        if isinstance(data, dict):
-            for key, value in data.items():
-                new_path = f"{current_path}.{key}" if current_path else key
+        if not isinstance(data, (dict, list)):
+            return
+        
+        # Bind the maps and helpers once; they are hit for every leaf
+        path_value_map = self.path_value_map
+        value_paths_map = self.value_paths_map
+        make_value_key = self._make_value_key
+        iter_children = self._iter_children
+        
+        stack = [iter_children(data, current_path, parent_key)]
+        while stack:
+            for new_path, value, context in stack[-1]:
+                # Most leaves are exact str/int/bool/None, which plain identity
+                # checks rule out as containers before the isinstance call
+                value_type = type(value)
+                if (value_type is not str and value_type is not int
+                        and value_type is not bool and value is not None
+                        and isinstance(value, (dict, list))):
+                    # Descend into nested structures, resuming here afterwards
+                    stack.append(iter_children(value, new_path, context))
+                    break
                 
-                if isinstance(value, (dict, list)):
-                    # Recurse into nested structures
-                    self._build_path_value_map(value, new_path, key)
-                else:
-                    # Store leaf values
-                    self.path_value_map[new_path] = value
-                    
-                    # Create hashable key for value tracking
-                    # Only track non-empty, non-null scalar values
-                    if value is not None and value != "" and value != {}:
-                        value_key = self._make_value_key(value, key)
-                        self.value_paths_map[value_key].append(new_path)
-        
-        elif isinstance(data, list):
-            for idx, item in enumerate(data):
-                new_path = f"{current_path}[{idx}]"
+                # Store leaf values
+                path_value_map[new_path] = value
                 
-                if isinstance(item, (dict, list)):
-                    self._build_path_value_map(item, new_path, parent_key)
-                else:
-                    # Store leaf values
-                    self.path_value_map[new_path] = item
-                    
-                    if item is not None and item != "" and item != {}:
-                        value_key = self._make_value_key(item, parent_key)
-                        self.value_paths_map[value_key].append(new_path)
+                # Create hashable key for value tracking
+                # Only track non-empty, non-null scalar values (leaves are
+                # never dicts here, so no empty-dict check is needed)
+                if value is not None and value != "":
+                    value_paths_map[make_value_key(value, context)].append(new_path)
+            else:
+                stack.pop()
+    
+    @staticmethod
+    def _iter_children(
+        node: Any,
+        current_path: str,
+        parent_key: str
+    ) -> Iterator[Tuple[str, Any, str]]:
+        """
+        Iterate the children of a dict or list node.
+        
+        Args:
+            node: Dict or list node
+            current_path: Path of the node in dot notation
+            parent_key: Key name the node's list items are tracked under
+            
+        Returns:
+            Iterator of (child path, child value, context key) tuples
+        """
+        if isinstance(node, dict):
+            return (
+                (f"{current_path}.{key}" if current_path else key, value, key)
+                for key, value in node.items()
+            )
+        return (
+            (f"{current_path}[{idx}]", item, parent_key)
+            for idx, item in enumerate(node)
+        )
     
     def _make_value_key(self, value: Any, context: str = "") -> str:
         """
@@ -172,8 +255,11 @@ class PathTransformationDetector:
         Returns:
             String key for value tracking
         """
-        # Include context to avoid false positives with common values
-        return f"{context}:{str(value)}"
+        # Include context to avoid false positives with common values;
+        # most leaves are already strings, so skip the str() call for them
+        if type(value) is not str:
+            value = str(value)
+        return f"{context}:{value}"
     
     def _find_duplicate_value_groups(self) -> Dict[str, List[str]]:
         """
@@ -182,12 +268,19 @@ class PathTransformationDetector:
         Returns:
             Dictionary mapping value keys to lists of paths
         """
+        return dict(self._iter_duplicate_value_groups())
+    
+    def _iter_duplicate_value_groups(self) -> Iterator[Tuple[str, List[str]]]:
+        """
+        Lazily yield groups of paths that share the same value.
+        
+        Yields:
+            Tuples of (value key, paths) for values found at two or more paths
+        """
         # Filter to only values that appear in multiple paths
-        return {
-            value_key: paths
-            for value_key, paths in self.value_paths_map.items()
-            if len(paths) >= 2
-        }
+        for value_key, paths in self.value_paths_map.items():
+            if len(paths) >= 2:
+                yield value_key, paths
     
     def _detect_parent_object_transformations(
         self,
@@ -225,28 +318,30 @@ class PathTransformationDetector:
             if not isinstance(parent_obj, dict):
                 continue  # Only process dict objects
             
-            # Count total fields in parent
-            total_fields = self._count_leaf_fields(parent_obj)
+            # Check if parent exists in reference first: it is a set lookup,
+            # while counting walks the whole parent object
+            if self._path_exists_in_reference(parent_path, reference_config):
+                continue
+            
+            # Count total fields in parent; past twice the transformed count
+            # the ratio is below 50% whatever the exact total, so stop there
             transformed_fields = len(child_transformations)
+            total_fields = self._count_leaf_fields(parent_obj, limit=2 * transformed_fields)
             
             # If 50% or more fields are transformed, suggest removing parent
             if total_fields > 0 and transformed_fields / total_fields >= 0.5:
-                # Check if parent exists in reference
-                parent_exists_in_ref = self._path_exists_in_config(parent_path, reference_config)
+                # Parent doesn't exist in reference - should be removed
+                # Find a representative new path from child transformations
+                representative_new_path = self._get_representative_new_path(child_transformations)
                 
-                if not parent_exists_in_ref:
-                    # Parent doesn't exist in reference - should be removed
-                    # Find a representative new path from child transformations
-                    representative_new_path = self._get_representative_new_path(child_transformations)
-                    
-                    parent_transformations.append(TransformationRecord(
-                        old_path=parent_path,
-                        new_path=representative_new_path,
-                        value=f"[Object with {total_fields} field(s)]",
-                        recommendation='move',
-                        reason=f'{transformed_fields}/{total_fields} child fields transformed, parent not in ENGNEW',
-                        confidence='high'
-                    ))
+                parent_transformations.append(TransformationRecord(
+                    old_path=parent_path,
+                    new_path=representative_new_path,
+                    value=f"[Object with {total_fields} field(s)]",
+                    recommendation='move',
+                    reason=f'{transformed_fields}/{total_fields} child fields transformed, parent not in ENGNEW',
+                    confidence='high'
+                ))
         
         return parent_transformations
     
@@ -290,19 +385,29 @@ class PathTransformationDetector:
         Returns:
             Value at path or None
         """
-        try:
-            current = config
-            segments = self._parse_path_segments(path)
-            
-            for segment in segments:
-                if isinstance(segment, int):
-                    current = current[segment]
-                else:
-                    current = current[segment]
+        return self._lookup_path(config, path)[1]
+    
+    def _lookup_path(self, config: Dict[str, Any], path: str) -> Tuple[bool, Any]:
+        """
+        Resolve a path in a single walk, reporting whether it exists.
+        
+        Args:
+            config: Configuration dictionary
+            path: Dot-notation path (e.g., "api.service.name" or "list[0].key")
             
-            return current
+        Returns:
+            Tuple of (found, value); value is None when the path is missing
+        """
+        current = config
+        try:
+            for segment in _path_segments(path):
+                if isinstance(segment, int) and not isinstance(current, list):
+                    return False, None
+                current = current[segment]
         except (KeyError, IndexError, TypeError):
-            return None
+            return False, None
+        
+        return True, current
     
     def _set_value_at_path(
         self, 
@@ -321,20 +426,36 @@ class PathTransformationDetector:
         Returns:
             Modified configuration
         """
+        result = copy.deepcopy(config)
+        self._set_value_at_path_in_place(result, path, value)
+        return result
+    
+    def _set_value_at_path_in_place(
+        self,
+        config: Dict[str, Any],
+        path: str,
+        value: Any
+    ) -> None:
+        """
+        Set value at a specific path, mutating the config.
+        
+        Only existing containers are written to; a missing path is left alone.
+        
+        Args:
+            config: Configuration dictionary to modify
+            path: Path to set value at
+            value: Value to set
+        """
         try:
-            result = copy.deepcopy(config)
-            segments = self._parse_path_segments(path)
+            segments = _path_segments(path)
             
             if not segments:
-                return result
+                return
             
             # Navigate to parent
-            current = result
+            current = config
             for segment in segments[:-1]:
-                if isinstance(segment, int):
-                    current = current[segment]
-                else:
-                    current = current[segment]
+                current = current[segment]
             
             # Set the value
             last_segment = segments[-1]
@@ -344,38 +465,42 @@ class PathTransformationDetector:
             else:
                 if isinstance(current, dict):
                     current[last_segment] = value
-            
-            return result
         except (KeyError, IndexError, TypeError):
-            # Path doesn't exist, return unchanged
-            return config
+            # Path doesn't exist, leave config unchanged
+            pass
     
-    def _count_leaf_fields(self, obj: Any) -> int:
+    def _count_leaf_fields(self, obj: Any, limit: Optional[int] = None) -> int:
         """
         Count the number of leaf (scalar) fields in an object.
         
         Args:
             obj: Object to count fields in
+            limit: Stop counting once the count exceeds this value
             
         Returns:
-            Number of leaf fields
+            Number of leaf fields (some number above limit if it was exceeded)
         """
         if not isinstance(obj, dict):
             return 0
         
+        # Walk with an explicit stack of dicts instead of recursing per level
         count = 0
-        for value in obj.values():
-            if isinstance(value, dict):
-                count += self._count_leaf_fields(value)
-            elif isinstance(value, list):
-                # For lists, count each item
-                for item in value:
-                    if isinstance(item, dict):
-                        count += self._count_leaf_fields(item)
-                    else:
-                        count += 1
-            else:
-                count += 1
+        stack = [obj]
+        while stack:
+            if limit is not None and count > limit:
+                break
+            for value in stack.pop().values():
+                if isinstance(value, dict):
+                    stack.append(value)
+                elif isinstance(value, list):
+                    # For lists, count each item
+                    for item in value:
+                        if isinstance(item, dict):
+                            stack.append(item)
+                        else:
+                            count += 1
+                else:
+                    count += 1
         
         return count
     
@@ -412,8 +537,11 @@ class PathTransformationDetector:
         Returns:
             True if path is a child of any parent path
         """
-        for parent_path in parent_paths:
-            if self._is_child_of(path, parent_path):
+        # A parent of path is exactly a proper prefix of it that is followed
+        # by '.' or '[', so look up each such prefix in the set instead of
+        # testing every parent path against it
+        for index, char in enumerate(path):
+            if (char == '.' or char == '[') and path[:index] in parent_paths:
                 return True
         return False
     
@@ -462,7 +590,7 @@ class PathTransformationDetector:
         paths_not_in_reference = []
         
         for path in paths:
-            if self._path_exists_in_config(path, reference_config):
+            if self._path_exists_in_reference(path, reference_config):
                 paths_in_reference.append(path)
             else:
                 paths_not_in_reference.append(path)
@@ -521,30 +649,54 @@ class PathTransformationDetector:
         Returns:
             True if path exists in config
         """
-        try:
-            current = config
-            
-            # Parse path segments (handle both dots and array indices)
-            segments = self._parse_path_segments(path)
-            
-            for segment in segments:
-                if isinstance(segment, int):
-                    # Array index
-                    if isinstance(current, list) and 0 <= segment < len(current):
-                        current = current[segment]
-                    else:
-                        return False
-                else:
-                    # Dictionary key
-                    if isinstance(current, dict) and segment in current:
-                        current = current[segment]
-                    else:
-                        return False
+        return self._lookup_path(config, path)[0]
+    
+    def _build_path_index(self, config: Dict[str, Any]) -> Set[Tuple[Any, ...]]:
+        """
+        Collect the segments of every path reachable in a configuration.
+        
+        Only string dict keys are indexed, since path strings can only address
+        those, so membership matches _path_exists_in_config exactly.
+        
+        Args:
+            config: Configuration dictionary to index
             
-            return True
+        Returns:
+            Set of segment tuples (strings for keys, ints for indices)
+        """
+        index: Set[Tuple[Any, ...]] = set()
+        stack: List[Tuple[Tuple[Any, ...], Any]] = [((), config)]
+        
+        while stack:
+            prefix, node = stack.pop()
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    if isinstance(key, str):
+                        segments = prefix + (key,)
+                        index.add(segments)
+                        stack.append((segments, value))
+            elif isinstance(node, list):
+                for i, item in enumerate(node):
+                    segments = prefix + (i,)
+                    index.add(segments)
+                    stack.append((segments, item))
+        
+        return index
+    
+    def _path_exists_in_reference(self, path: str, reference_config: Dict[str, Any]) -> bool:
+        """
+        Check if a path exists in the reference, using the prebuilt index when possible.
         
-        except (KeyError, IndexError, TypeError):
-            return False
+        Args:
+            path: Dot-notation path
+            reference_config: ENGNEW reference configuration
+            
+        Returns:
+            True if path exists in the reference
+        """
+        if reference_config is not self._reference_config:
+            return self._path_exists_in_config(path, reference_config)
+        return _path_segments(path) in self._reference_index
     
     def _parse_path_segments(self, path: str) -> List[Any]:
         """
@@ -556,23 +708,7 @@ class PathTransformationDetector:
         Returns:
             List of segments (strings for keys, ints for indices)
         """
-        import re
-        segments = []
-        
-        # Split on dots, but handle array indices
-        parts = path.split('.')
-        for part in parts:
-            # Check if part contains array index
-            match = re.match(r'([^\[]+)\[(\d+)\]', part)
-            if match:
-                # Part with array index: "list[0]"
-                segments.append(match.group(1))  # key
-                segments.append(int(match.group(2)))  # index
-            else:
-                # Simple key
-                segments.append(part)
-        
-        return segments
+        return list(_path_segments(path))
     
     def apply_transformations(
         self,
@@ -589,6 +725,7 @@ class PathTransformationDetector:
         Returns:
             Transformed configuration
         """
+        # Copy once; every transformation below edits this copy in place
         result = copy.deepcopy(config)
         
         # Sort transformations: parent objects first, then child fields
@@ -603,7 +740,7 @@ class PathTransformationDetector:
                 # Check if path still exists (parent might have been removed)
                 if self._path_exists_in_config(transformation.old_path, result):
                     # Move value from old path to new path and remove old path
-                    result = self._move_value(
+                    self._move_value_in_place(
                         result,
                         transformation.old_path,
                         transformation.new_path,
@@ -612,7 +749,7 @@ class PathTransformationDetector:
             elif transformation.recommendation == 'remove_old':
                 # Only remove old path
                 if self._path_exists_in_config(transformation.old_path, result):
-                    result = self._remove_path(result, transformation.old_path)
+                    self._remove_path_in_place(result, transformation.old_path)
         
         return result
     
@@ -636,28 +773,36 @@ class PathTransformationDetector:
             Modified configuration
         """
         result = copy.deepcopy(config)
+        self._move_value_in_place(result, old_path, new_path, value)
+        return result
+    
+    def _move_value_in_place(
+        self,
+        config: Dict[str, Any],
+        old_path: str,
+        new_path: str,
+        value: Any
+    ) -> None:
+        """
+        Move a value from old path to new path, mutating the config.
         
-        # For parent object transformations, get the actual object
-        if "[Object with" in str(value):
-            # This is a parent object transformation
-            old_value = self._get_value_at_path(result, old_path)
-            if old_value and isinstance(old_value, dict):
-                # Try to intelligently merge values to new location
-                # For now, we'll log this but not auto-transfer complex objects
-                # The new structure should already have correct values from Stage 2
-                pass
-        else:
+        Args:
+            config: Configuration dictionary to modify
+            old_path: Source path
+            new_path: Destination path (may include wildcards like *)
+            value: Value to move
+        """
+        # Parent object transformations are not auto-transferred: the new
+        # structure should already have correct values from Stage 2
+        if "[Object with" not in str(value):
             # Single field transformation - ensure value is at new path
-            # Get actual value from old path
-            old_value = self._get_value_at_path(result, old_path)
+            old_value = self._get_value_at_path(config, old_path)
             if old_value is not None:
                 # Try to set value at new path if it exists
-                result = self._set_value_at_path(result, new_path, old_value)
+                self._set_value_at_path_in_place(config, new_path, old_value)
         
         # Remove old path
-        result = self._remove_path(result, old_path)
-        
-        return result
+        self._remove_path_in_place(config, old_path)
     
     def _remove_path(
         self,
@@ -675,19 +820,30 @@ class PathTransformationDetector:
             Modified configuration
         """
         result = copy.deepcopy(config)
+        self._remove_path_in_place(result, path)
+        return result
+    
+    def _remove_path_in_place(
+        self,
+        config: Dict[str, Any],
+        path: str
+    ) -> None:
+        """
+        Remove a path from configuration, mutating it.
         
+        Args:
+            config: Configuration dictionary to modify
+            path: Path to remove
+        """
         try:
-            segments = self._parse_path_segments(path)
+            segments = _path_segments(path)
             
-            # Navigate to parent
-            current = result
-            parents = [result]
+            # Navigate to parent, remembering every container on the way
+            current = config
+            parents = [config]
             
-            for i, segment in enumerate(segments[:-1]):
-                if isinstance(segment, int):
-                    current = current[segment]
-                else:
-                    current = current[segment]
+            for segment in segments[:-1]:
+                current = current[segment]
                 parents.append(current)
             
             # Remove the last segment
@@ -700,18 +856,17 @@ class PathTransformationDetector:
                     del current[last_segment]
             
             # Clean up empty parents
-            self._cleanup_empty_parents(result, segments[:-1])
+            self._cleanup_empty_parents(config, segments[:-1], parents)
         
         except (KeyError, IndexError, TypeError):
             # Path doesn't exist, nothing to remove
             pass
-        
-        return result
     
     def _cleanup_empty_parents(
         self,
         config: Dict[str, Any],
-        parent_segments: List[Any]
+        parent_segments: Sequence[Any],
+        parents: Optional[List[Any]] = None
     ) -> None:
         """
         Remove empty parent dictionaries after path removal.
@@ -719,17 +874,19 @@ class PathTransformationDetector:
         Args:
             config: Root configuration
             parent_segments: Segments leading to the removed path
+            parents: Containers along parent_segments, starting with config, as
+                recorded while navigating (re-navigated from config if omitted)
         """
         # Work backwards through parent segments
         for i in range(len(parent_segments) - 1, -1, -1):
             try:
-                current = config
-                
-                # Navigate to the parent
-                for segment in parent_segments[:i]:
-                    if isinstance(segment, int):
-                        current = current[segment]
-                    else:
+                if parents is not None:
+                    # Removals below level i never change the containers above it
+                    current = parents[i]
+                else:
+                    # Navigate to the parent
+                    current = config
+                    for segment in parent_segments[:i]:
                         current = current[segment]
                 
                 # Check if the target is empty
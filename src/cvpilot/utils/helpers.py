@@ -2,6 +2,8 @@
 Helper utility functions for config migrator.
 """
 
+import os
+import stat
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -16,12 +18,22 @@ def get_file_info(file_path: str) -> Dict[str, Any]:
     Returns:
         Dictionary with file information
     """
-    path = Path(file_path)
+    name = os.path.basename(file_path)
+    if not name or name == ".":
+        # Trailing separators or "." components; pathlib names these
+        # differently, so defer to it for the rare paths that have them
+        name = Path(file_path).name
+    # One stat answers all three questions; like Path.exists(), a path that
+    # cannot be stat'ed at all is reported as missing
+    try:
+        st = os.stat(file_path)
+    except (OSError, ValueError):
+        return {"name": name, "size": 0, "exists": False, "is_file": False}
     return {
-        "name": path.name,
-        "size": path.stat().st_size if path.exists() else 0,
-        "exists": path.exists(),
-        "is_file": path.is_file(),
+        "name": name,
+        "size": st.st_size,
+        "exists": True,
+        "is_file": stat.S_ISREG(st.st_mode),
     }
 
 
@@ -55,10 +67,15 @@ def validate_file_paths(file_paths: List[str]) -> tuple[bool, List[str]]:
     errors = []
 
     for file_path in file_paths:
-        path = Path(file_path)
-        if not path.exists():
+        # One stat per path answers both "exists" and "is a regular file".
+        # Like Path.exists(), any path that cannot be stat'ed (symlink loop,
+        # over-long name, ...) counts as missing rather than raising.
+        try:
+            st = os.stat(file_path)
+        except (OSError, ValueError):
             errors.append(f"File not found: {file_path}")
-        elif not path.is_file():
+            continue
+        if not stat.S_ISREG(st.st_mode):
             errors.append(f"Not a file: {file_path}")
 
     return len(errors) == 0, errors
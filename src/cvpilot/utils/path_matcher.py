@@ -5,7 +5,46 @@ Supports exact paths, wildcards, array indices, and nested patterns.
 """
 
 import re
-from typing import List, Set, Optional, Union
+from collections import defaultdict
+from functools import lru_cache
+from typing import List, Pattern, Set, Optional, Union
+
+# Concrete array indices such as [0], [12]
+_ARRAY_INDEX_RE = re.compile(r'\[\d+\]')
+
+
+@lru_cache(maxsize=1024)
+def _compile_wildcard(pattern: str) -> Optional[Pattern]:
+    """
+    Build and compile the regex for a wildcard pattern, once per pattern.
+
+    Args:
+        pattern: Pattern with wildcards
+
+    Returns:
+        Compiled regex, or None if the pattern does not form a valid regex
+    """
+    # Convert pattern to regex
+    regex_pattern = pattern
+    
+    # Handle array wildcards [*] -> [\d+]
+    regex_pattern = regex_pattern.replace('[*]', r'\[\d+\]')
+    
+    # Handle field wildcards * -> [^.]+
+    regex_pattern = regex_pattern.replace('*', r'[^.]+')
+    
+    # Escape other regex special characters
+    regex_pattern = re.escape(regex_pattern)
+    regex_pattern = regex_pattern.replace(r'\[\\d\+\]', r'\[\d+\]')
+    regex_pattern = regex_pattern.replace(r'\[\.\]\+', r'[^.]+')
+    
+    # Add anchors
+    regex_pattern = f"^{regex_pattern}$"
+    
+    try:
+        return re.compile(regex_pattern)
+    except re.error:
+        return None
 
 
 class PathMatcher:
@@ -45,27 +84,10 @@ class PathMatcher:
         Returns:
             True if matches
         """
-        # Convert pattern to regex
-        regex_pattern = pattern
-        
-        # Handle array wildcards [*] -> [\d+]
-        regex_pattern = regex_pattern.replace('[*]', r'\[\d+\]')
-        
-        # Handle field wildcards * -> [^.]+
-        regex_pattern = regex_pattern.replace('*', r'[^.]+')
-        
-        # Escape other regex special characters
-        regex_pattern = re.escape(regex_pattern)
-        regex_pattern = regex_pattern.replace(r'\[\\d\+\]', r'\[\d+\]')
-        regex_pattern = regex_pattern.replace(r'\[\.\]\+', r'[^.]+')
-        
-        # Add anchors
-        regex_pattern = f"^{regex_pattern}$"
-        
-        try:
-            return bool(re.match(regex_pattern, field_path))
-        except re.error:
+        compiled = _compile_wildcard(pattern)
+        if compiled is None:
             return False
+        return bool(compiled.match(field_path))
     
     @staticmethod
     def find_matching_paths(paths: List[str], pattern: str) -> List[str]:
@@ -133,7 +155,7 @@ class PathMatcher:
             Normalized path with wildcards
         """
         # Replace [0], [1], [2], etc. with [*]
-        return re.sub(r'\[\d+\]', '[*]', path)
+        return _ARRAY_INDEX_RE.sub('[*]', path)
     
     @staticmethod
     def get_array_paths(paths: List[str]) -> Set[str]:
@@ -164,27 +186,23 @@ class PathMatcher:
         Returns:
             Dictionary mapping field types to lists of paths
         """
-        groups = {}
+        groups = defaultdict(list)
         
         for path in paths:
             field_name = PathMatcher.extract_field_name(path).lower()
             
-            # Determine field type
-            field_type = None
+            # Determine field type ('commonlabels' and friends contain 'label',
+            # so one substring test per family is enough)
             if 'annotation' in field_name:
                 field_type = 'annotations'
             elif 'label' in field_name:
                 field_type = 'labels'
-            elif 'commonlabel' in field_name:
-                field_type = 'commonlabels'
             else:
                 field_type = field_name
             
-            if field_type not in groups:
-                groups[field_type] = []
             groups[field_type].append(path)
         
-        return groups
+        return dict(groups)
     
     @staticmethod
     def suggest_patterns(paths: List[str]) -> List[str]:
@@ -208,12 +226,10 @@ class PathMatcher:
                 patterns.add(f"*.{field_type}")
         
         # Group by parent paths
-        parent_groups = {}
+        parent_groups = defaultdict(list)
         for path in paths:
             parent = PathMatcher.extract_parent_path(path)
             if parent:
-                if parent not in parent_groups:
-                    parent_groups[parent] = []
                 parent_groups[parent].append(path)
         
         for parent, parent_paths in parent_groups.items():
@@ -3,27 +3,50 @@ Tests for CLI commands and user interface.
 """
 
 import os
-import tempfile
 from unittest.mock import MagicMock, patch
 
+import pytest
 from click.testing import CliRunner
 
 from cvpilot.cli.commands import migrate
-from cvpilot.core.parser import YAMLParser
+from cvpilot.core import parser as parser_module
+from cvpilot.core.parser import CACHE_ENV_VAR, YAMLParser
+
+# Only used to write inputs and read outputs, which keeps no per-file state
+_PARSER = YAMLParser()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def yaml_parse_cache():
+    """Let the migrate runs in this module share parsed documents.
+
+    Every test migrates the same unchanged input files; with the cache they
+    are parsed once and later loads get copies. The shared default parsers
+    are swapped out too, so none built here keeps the cache afterwards.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv(CACHE_ENV_VAR, "1")
+        monkeypatch.setattr(parser_module, "_default_parsers", {})
+        yield
 
 
 class TestCLICommands:
     """Test CLI commands and user interface."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-        self.temp_dir = tempfile.mkdtemp()
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def input_files(cls, tmp_path_factory):
+        """Write the input YAML files once for all tests in the class.
+
+        Tests only read these files and give their own outputs distinct
+        names, so one directory can be shared; pytest removes it later.
+        """
+        cls.temp_dir = str(tmp_path_factory.mktemp("cli"))
 
         # Create test YAML files
-        self.nsprev_file = os.path.join(self.temp_dir, "nsprev.yaml")
-        self.engprev_file = os.path.join(self.temp_dir, "engprev.yaml")
-        self.engnew_file = os.path.join(self.temp_dir, "engnew.yaml")
+        cls.nsprev_file = os.path.join(cls.temp_dir, "nsprev.yaml")
+        cls.engprev_file = os.path.join(cls.temp_dir, "engprev.yaml")
+        cls.engnew_file = os.path.join(cls.temp_dir, "engnew.yaml")
 
         # Sample NSPREV data (namespace previous - site-specific)
         nsprev_data = {
@@ -86,16 +109,23 @@ class TestCLICommands:
         }
 
         # Write test files
-        parser = YAMLParser()
-        parser.save_yaml_file(nsprev_data, self.nsprev_file)
-        parser.save_yaml_file(engprev_data, self.engprev_file)
-        parser.save_yaml_file(engnew_data, self.engnew_file)
+        parser = _PARSER
+        parser.save_yaml_file(nsprev_data, cls.nsprev_file)
+        parser.save_yaml_file(engprev_data, cls.engprev_file)
+        parser.save_yaml_file(engnew_data, cls.engnew_file)
+
+    @pytest.fixture(autouse=True)
+    def work_in_tmp_path(self, tmp_path, monkeypatch):
+        """Run each test from its own directory.
 
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
+        migrate writes the diff file, and the output file when -o is not
+        given, to the current directory.
+        """
+        monkeypatch.chdir(tmp_path)
 
-        shutil.rmtree(self.temp_dir)
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.runner = CliRunner()
 
     def test_migrate_basic_usage(self):
         """Test basic migrate command usage with new naming."""
@@ -132,7 +162,7 @@ class TestCLICommands:
         assert os.path.exists(output_file)
 
         # Verify output file content
-        parser = YAMLParser()
+        parser = _PARSER
         output_data = parser.load_yaml_file(output_file)
         # NSPREV should have highest precedence
         assert (
@@ -146,7 +176,7 @@ class TestCLICommands:
         """Test automatic filename generation from nsprev + engnew version."""
         # Create a test file with version in filename
         nsprev_versioned_file = os.path.join(self.temp_dir, "site-config_25.1.102.yaml")
-        parser = YAMLParser()
+        parser = _PARSER
         parser.save_yaml_file(
             {
                 "global": {
@@ -189,7 +219,7 @@ class TestCLICommands:
         # Verify diff file exists in current directory
         diff_file_path = "diff_nsprev_engprev.yaml"
         if os.path.exists(diff_file_path):
-            parser = YAMLParser()
+            parser = _PARSER
             diff_data = parser.load_yaml_file(diff_file_path)
             # Should only contain differences
             assert "global" in diff_data
@@ -366,7 +396,7 @@ class TestCLICommands:
         assert os.path.exists(output_file)
 
         # Verify the merged content
-        parser = YAMLParser()
+        parser = _PARSER
         output_data = parser.load_yaml_file(output_file)
 
         # Should have NSPREV site value
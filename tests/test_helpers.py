@@ -52,6 +52,19 @@ class TestHelperFunctions:
             assert info["exists"] is True
             assert info["is_file"] is False
 
+            # A trailing separator still names the directory itself
+            assert get_file_info(temp_dir + os.sep)["name"] == os.path.basename(temp_dir)
+
+    def test_get_file_info_symlink_loop(self):
+        """Test get_file_info reports a path that cannot be stat'ed as missing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loop = os.path.join(temp_dir, "loop")
+            os.symlink(loop, loop)
+
+            info = get_file_info(loop)
+
+            assert info == {"name": "loop", "size": 0, "exists": False, "is_file": False}
+
     def test_get_file_info_empty_file(self):
         """Test get_file_info with empty file."""
         with tempfile.NamedTemporaryFile(delete=False) as f:
@@ -163,6 +176,18 @@ class TestHelperFunctions:
             assert len(errors) == 1
             assert "Not a file:" in errors[0]
 
+    def test_validate_file_paths_unreadable_path(self):
+        """Test validate_file_paths reports paths that cannot be stat'ed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loop = os.path.join(temp_dir, "loop")
+            os.symlink(loop, loop)
+            too_long = "x" * 5000
+
+            is_valid, errors = validate_file_paths([loop, too_long])
+
+            assert is_valid is False
+            assert errors == [f"File not found: {loop}", f"File not found: {too_long}"]
+
     def test_validate_file_paths_mixed_validity(self):
         """Test validate_file_paths with mixed valid and invalid files."""
         with tempfile.NamedTemporaryFile(delete=False) as f:
@@ -2,7 +2,11 @@
 Tests for configuration merger functionality.
 """
 
-from cvpilot.core.merger import ConfigMerger
+from ruamel.yaml.scalarstring import DoubleQuotedScalarString
+
+from cvpilot.core.comment_preserving_merger import CommentPreservingMerger
+from cvpilot.core.merger import ConfigMerger, _clone
+from cvpilot.core.rulebook import RulebookManager
 
 
 class TestConfigMerger:
@@ -191,6 +195,15 @@ class TestConfigMerger:
         # DIFF keys not in ENGNEW should be ignored
         assert "ignored_section" not in result
 
+    def test_merge_configs_stage2_empty_diff(self):
+        """Test Stage 2 with an empty DIFF returns an unchanged copy of ENGNEW."""
+        engnew = {"global": {"version": "25.1.200"}, "api": {"replicas": 2}}
+
+        result = ConfigMerger.merge_configs_stage2({}, engnew)
+
+        assert result == engnew
+        assert result is not engnew
+
     def test_merge_configs_list_handling_stage1(self):
         """Test Stage 1 difference extraction with list handling."""
         engprev = {
@@ -326,3 +339,168 @@ class TestConfigMerger:
 
         assert "new_section" in differences
         assert differences["new_section"]["key"] == "value"
+
+    def test_values_differ(self):
+        """Test _values_differ fast paths agree with plain equality."""
+        shared = {"items": [1, 2, 3]}
+
+        assert ConfigMerger._values_differ(shared, shared) is False
+        assert ConfigMerger._values_differ([1, 2], [1, 2, 3]) is True
+        assert ConfigMerger._values_differ({"a": 1}, {"a": 1, "b": 2}) is True
+        assert ConfigMerger._values_differ({"a": [1]}, {"a": [1]}) is False
+        assert ConfigMerger._values_differ(1, 1.0) is False
+        assert ConfigMerger._values_differ("1", 1) is True
+
+    def test_merge_configs_stage2_does_not_mutate_inputs(self):
+        """Test Stage 2 overlay leaves ENGNEW and the diff untouched."""
+        engnew = {
+            "api": {"replicas": 2, "image": {"tag": "25.1.200"}},
+            "db": {"hosts": ["a", "b"]},
+        }
+        diff_file = {"api": {"replicas": 4}, "db": {"hosts": ["c"]}}
+
+        result = ConfigMerger.merge_configs_stage2(diff_file, engnew)
+
+        assert result["api"]["replicas"] == 4
+        assert result["db"]["hosts"] == ["c", "b"]
+        assert engnew["api"]["replicas"] == 2
+        assert engnew["db"]["hosts"] == ["a", "b"]
+        assert result["api"]["image"] is not engnew["api"]["image"]
+
+    def test_clone_copies_containers(self):
+        """Test _clone rebuilds nested containers without aliasing."""
+        original = {"api": {"ports": [80, 443]}, "name": "svc"}
+
+        cloned = _clone(original)
+
+        assert cloned == original
+        assert cloned["api"] is not original["api"]
+        assert cloned["api"]["ports"] is not original["api"]["ports"]
+        cloned["api"]["ports"].append(8080)
+        assert original["api"]["ports"] == [80, 443]
+
+    def test_clone_keeps_scalar_types(self):
+        """Test _clone keeps plain scalars and ruamel scalar subclasses intact."""
+        quoted = DoubleQuotedScalarString("25.1.200")
+        original = {"tag": quoted, "replicas": 2, "enabled": True, "host": None}
+
+        cloned = _clone(original)
+
+        assert cloned == original
+        assert type(cloned["tag"]) is DoubleQuotedScalarString
+        assert type(cloned["enabled"]) is bool
+
+    def test_smart_merge_list_deduplicates(self):
+        """Test simple list merge keeps ENGNEW order and adds unique NSPREV items."""
+        engnew = ["a", "b", ["x"]]
+        nsprev = ["b", "c", "c", ["x"], ["y"]]
+
+        result = ConfigMerger._smart_merge_list(engnew, nsprev)
+
+        assert result == ["a", "b", ["x"], "c", ["y"]]
+
+    def test_merge_with_rulebook_does_not_mutate_inputs(self):
+        """Test rulebook merge without rules overlays the diff on a copy of ENGNEW."""
+        engnew = {"api": {"replicas": 2, "image": {"tag": "25.1.200"}}, "db": {"port": 3306}}
+        diff = {"api": {"replicas": 4}, "extra": {"key": "value"}}
+
+        result = ConfigMerger.merge_with_rulebook(diff, engnew)
+
+        assert result == {
+            "api": {"replicas": 4, "image": {"tag": "25.1.200"}},
+            "db": {"port": 3306},
+            "extra": {"key": "value"},
+        }
+        assert engnew["api"]["replicas"] == 2
+        assert result["db"] is not engnew["db"]
+
+    def test_merge_dict_with_strategy_merge(self):
+        """Test merge strategy keeps ENGNEW key order with NSPREV values winning."""
+        engnew = {"a": 1, "b": {"x": 1}, "c": 3}
+        nsprev = {"b": {"y": 2}, "d": 4}
+
+        result = ConfigMerger._merge_dict_with_strategy(engnew, nsprev, "merge")
+
+        assert list(result) == ["a", "b", "c", "d"]
+        assert result == {"a": 1, "b": {"y": 2}, "c": 3, "d": 4}
+        assert result["b"] is not nsprev["b"]
+
+    def test_replace_version_references(self):
+        """Test old version strings are replaced throughout a copied config."""
+        config = {
+            "global": {"image": {"tag": "25.1.200"}},
+            "api": {"image": "repo/api:24.3.100", "replicas": 2, "enabled": True},
+            "hooks": [{"tag": "24.3.100"}, None],
+        }
+
+        result = ConfigMerger.replace_version_references(config, None)
+
+        assert result == {
+            "global": {"image": {"tag": "25.1.200"}},
+            "api": {"image": "repo/api:25.1.200", "replicas": 2, "enabled": True},
+            "hooks": [{"tag": "25.1.200"}, None],
+        }
+        assert config["api"]["image"] == "repo/api:24.3.100"
+        assert result["hooks"][0] is not config["hooks"][0]
+
+    def test_merge_diff_with_rulebook_nsprev_lookups(self):
+        """Test nsprev rules resolve original values at nested and dotted-key paths."""
+        rulebook = RulebookManager()
+        rulebook.rules = {
+            "default_strategy": "engnew",
+            "path_overrides": {
+                "api.svc.port": {"strategy": "nsprev"},
+                "api.svc.gone": {"strategy": "nsprev"},
+                "api.a.b": {"strategy": "nsprev"},
+            },
+        }
+        engnew = {"api": {"svc": {"port": 80, "gone": 1}, "a.b": "engnew"}}
+        diff = {"api": {"svc": {"port": 81, "gone": 2}, "a.b": "diff"}}
+        original_nsprev = {"api": {"svc": {"port": 8080}, "a": {"b": "nested"}, "a.b": "dotted"}}
+
+        result = ConfigMerger._merge_diff_with_rulebook(
+            engnew, diff, original_nsprev, rulebook, "", original_nsprev
+        )
+
+        # "api.a.b" splits into api -> a -> b, exactly as a root lookup would
+        assert result == {"api": {"svc": {"port": 8080}, "a.b": "nested"}}
+
+    def test_merge_list_of_dicts_by_key(self):
+        """Test single-key dict lists keep ENGNEW items and add unseen NSPREV keys."""
+        engnew = [{"a": "engnew"}, {"b": "2"}, {"x": 1, "y": 2}]
+        nsprev = [{"a": "nsprev"}, {"c": "3"}, {"c": "again"}]
+
+        result = ConfigMerger._merge_list_of_dicts(engnew, nsprev)
+
+        assert result == [{"a": "engnew"}, {"b": "2"}, {"c": "3"}, {"c": "again"}]
+        assert result[0] is not engnew[0]
+
+    def test_count_leaf_keys(self):
+        """Test non-dict values are counted through any nesting depth."""
+        data = {"a": 1, "b": {"c": [1, 2], "d": {"e": None, "f": {}}}, "g": {}}
+
+        assert ConfigMerger.count_leaf_keys(data) == 3
+        assert ConfigMerger.count_leaf_keys({}) == 0
+
+
+class TestCommentPreservingMerger:
+    """Test cases for CommentPreservingMerger."""
+
+    def test_merge_with_comments_aliased_nodes(self, tmp_path):
+        """Test DIFF values land in document order when ENGNEW nodes are aliased."""
+        engnew_file = tmp_path / "engnew.yaml"
+        engnew_file.write_text(
+            "defaults: &d {timeout: 30}\nprimary: *d\nsecondary: *d\nlast: *d\n"
+        )
+        diff = {
+            "primary": {"timeout": 10},
+            "secondary": {"timeout": 20},
+            "last": {"timeout": 40},
+        }
+
+        result = CommentPreservingMerger().merge_with_comments(
+            str(engnew_file), diff, str(tmp_path / "merged.yaml")
+        )
+
+        # The last write in document order wins, as with a recursive walk
+        assert result["defaults"]["timeout"] == 40
@@ -28,6 +28,8 @@ class TestNRFComponentDetection:
             ("rcnltxekvzwcnrf-y-or-x-102-ocnrf_24.2.4.yaml", ComponentType.NRF),
             ("nrf_values.yaml", ComponentType.NRF),
             ("occndbtier_custom_values_25.1.102.yaml", ComponentType.CNDBTIER),
+            ("OCUDR-values.yaml", ComponentType.UDR),
+            ("pcf_values.yaml", ComponentType.PCF),
             ("random_file.yaml", ComponentType.UNKNOWN),
         ]
 
@@ -67,6 +69,12 @@ class TestNRFComponentDetection:
         }
         assert ComponentType.detect_from_content(cndbtier_content) == ComponentType.CNDBTIER
 
+        # CNDBTIER namespace buried in nested values
+        nested_cndbtier_content = {
+            'services': [{'name': 'db', 'namespace': 'OCCNE-cndbtier'}]
+        }
+        assert ComponentType.detect_from_content(nested_cndbtier_content) == ComponentType.CNDBTIER
+
         # Unknown content
         unknown_content = {
             'random': {'key': 'value'}
@@ -114,6 +122,29 @@ class TestNRFConflictAnalysis:
         for field in expected_fields:
             assert field in fields, f"Missing expected field: {field}"
 
+    def test_field_classification_follows_component(self):
+        """Test cached key classification is refreshed when the field set changes."""
+        analyzer = ConflictAnalyzer()
+        data = {'nfregistration': {'replicas': 1}, 'annotations': []}
+
+        assert list(analyzer._find_all_list_fields(data)) == ['annotations']
+
+        analyzer.list_field_names = analyzer.COMPONENT_FIELDS[ComponentType.NRF]
+        fields = analyzer._find_all_list_fields(data)
+        assert 'nfregistration' in fields
+
+    def test_find_all_list_fields_order(self):
+        """Test fields are collected depth-first, in document order."""
+        analyzer = ConflictAnalyzer()
+        data = {
+            'global': {'annotations': [], 'app': {'labels': {}}, 'commonlabels': {}},
+            'labels': {},
+        }
+
+        assert list(analyzer._find_all_list_fields(data)) == [
+            'global.annotations', 'global.app.labels', 'global.commonlabels', 'labels'
+        ]
+
     def test_nrf_specific_patterns(self, nrf_analyzer):
         """Test NRF-specific site pattern detection."""
         nrf_items = [
@@ -124,6 +155,51 @@ class TestNRFConflictAnalysis:
         score = nrf_analyzer._calculate_site_specific_score(nrf_items)
         assert score > 0.5, "Should detect NRF-specific site patterns"
 
+    def test_has_unique_items(self, nrf_analyzer):
+        """Test unique-item detection for hashable and unhashable list items."""
+        assert nrf_analyzer._has_unique_items(['a', 'b'], ['b', 'a', 'c']) is False
+        assert nrf_analyzer._has_unique_items(['a', 'd'], ['a', 'b']) is True
+        assert nrf_analyzer._has_unique_items([['x']], [['x'], ['y']]) is False
+        assert nrf_analyzer._has_unique_items([['z']], [['x']]) is True
+        assert nrf_analyzer._has_unique_items([{'k': 1}, {'n': 2}], [{'k': 3}]) is True
+        assert nrf_analyzer._has_unique_items([{'k': 1}], [{'k': 2}, {'n': 3}]) is False
+        assert nrf_analyzer._get_dict_key({'k': 1}) == 'k'
+        assert nrf_analyzer._get_dict_key({'k': 1, 'n': 2}) is None
+
+    def test_detect_conflicts_matches_relative_paths(self):
+        """Test fields pair up across files by their last two path segments."""
+        analyzer = ConflictAnalyzer()
+        nsprev_lists = {'old.api.annotations': ['a'], 'db.labels': ['x']}
+        engnew_lists = {
+            'new.api.annotations': ['b'],
+            'other.api.annotations': ['c'],
+            'cache.labels': ['y'],
+        }
+
+        conflicts = analyzer._detect_conflicts(nsprev_lists, engnew_lists)
+
+        assert [c['path'] for c in conflicts] == ['old.api.annotations']
+        assert conflicts[0]['engnew_items'] == ['c']
+
+    def test_analyze_files_reuses_parser(self):
+        """Test one parser instance serves every analysis run by an analyzer."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            nsprev_path = os.path.join(temp_dir, 'nsprev.yaml')
+            engnew_path = os.path.join(temp_dir, 'engnew.yaml')
+            with open(nsprev_path, 'w') as f:
+                f.write("annotations:\n  - site.example/a: '1'\n")
+            with open(engnew_path, 'w') as f:
+                f.write("annotations:\n  - site.example/b: '2'\n")
+
+            parser = YAMLParser()
+            analyzer = ConflictAnalyzer(parser)
+            first = analyzer.analyze_files(nsprev_path, engnew_path)
+            second = analyzer.analyze_files(nsprev_path, engnew_path)
+
+            assert analyzer._parser is parser
+            assert first['summary'] == second['summary']
+            assert 'annotations' in first['nsprev_lists']
+
 
 class TestNRFRulebookGeneration:
     """Test NRF-specific rulebook generation."""
@@ -7,7 +7,7 @@ import tempfile
 
 import pytest
 
-from cvpilot.core.parser import YAMLParser
+from cvpilot.core.parser import CACHE_ENV_VAR, YAMLParser, get_default_parser
 
 
 class TestYAMLParser:
@@ -139,6 +139,25 @@ class TestYAMLParser:
             for temp_file in temp_files:
                 os.unlink(temp_file)
 
+    def test_validate_all_files_missing_file(self):
+        """Test a missing file is reported as not found."""
+        parser = YAMLParser()
+        is_valid, error = parser.validate_all_files(["nonexistent_file.yaml"])
+        assert is_valid is False
+        assert error == "File not found: nonexistent_file.yaml"
+
+    def test_validate_all_files_symlink_loop(self):
+        """Test a path that cannot be stat'ed is reported as not found."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loop = os.path.join(temp_dir, "loop")
+            os.symlink(loop, loop)
+
+            for enable_cache in (False, True):
+                parser = YAMLParser(enable_cache=enable_cache)
+                is_valid, error = parser.validate_all_files([loop])
+                assert is_valid is False
+                assert error == f"File not found: {loop}"
+
     def test_save_yaml_file(self):
         """Test saving YAML data to file."""
         test_data = {
@@ -165,3 +184,177 @@ class TestYAMLParser:
                 assert "test-site" in content
         finally:
             os.unlink(temp_file)
+
+    def test_normalize_annotation_list(self):
+        """Test multi-key annotation items are split into single-key dicts."""
+        parser = YAMLParser()
+
+        already_normal = [{"a": "1"}, {"b": "2"}]
+        rebuilt = parser._normalize_annotation_list(already_normal)
+        assert rebuilt == already_normal
+        assert rebuilt is not already_normal
+
+        split = parser._normalize_annotation_list([{"a": "1", "b": "2"}, "c"])
+        assert split == [{"a": "1"}, {"b": "2"}, "c"]
+
+    def test_normalize_annotations_lists_copies_shared_containers(self):
+        """Test the normalized tree shares no containers with the input or itself."""
+        parser = YAMLParser()
+        ports = {"http": 80}
+        annotations = [{"a": "1"}]
+        data = {
+            "svc": {"ports": ports, "annotations": annotations},
+            "copy": {"ports": ports, "annotations": annotations},
+            "split": {"annotations": [{"x": "1", "y": "2"}]},
+        }
+
+        result = parser._normalize_annotations_lists(data)
+
+        assert result == {
+            "svc": {"ports": {"http": 80}, "annotations": [{"a": "1"}]},
+            "copy": {"ports": {"http": 80}, "annotations": [{"a": "1"}]},
+            "split": {"annotations": [{"x": "1"}, {"y": "2"}]},
+        }
+        assert result["svc"] is not data["svc"]
+        assert result["svc"]["annotations"] is not annotations
+        assert result["copy"]["ports"] is not ports
+        assert result["copy"]["annotations"] is not annotations
+        assert result["copy"]["annotations"][0] is not annotations[0]
+
+        with tempfile.NamedTemporaryFile(suffix=".yaml", delete=False) as f:
+            temp_file = f.name
+
+        try:
+            parser.save_yaml_file(data, temp_file)
+            with open(temp_file) as f:
+                content = f.read()
+            assert "&" not in content and "*id" not in content
+        finally:
+            os.unlink(temp_file)
+
+    def test_validated_document_is_handed_to_next_load(self):
+        """Test a validated file is not parsed again by the next load."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            f.write("global:\n  sitename: test-site\n")
+            temp_file = f.name
+
+        try:
+            parser = YAMLParser(enable_cache=False)
+            assert parser.validate_yaml_syntax(temp_file)
+            assert os.path.abspath(temp_file) in parser._validated
+
+            first = parser.load_yaml_file(temp_file)
+            assert not parser._validated
+            second = parser.load_yaml_file(temp_file)
+            assert first == second == {"global": {"sitename": "test-site"}}
+            # The validated document is handed over once, never shared
+            assert first is not second
+
+            # A file changed after validation is parsed again
+            assert parser.validate_yaml_syntax(temp_file)
+            with open(temp_file, "w") as f:
+                f.write("global:\n  sitename: other-site-name\n")
+            assert parser.load_yaml_file(temp_file) == {"global": {"sitename": "other-site-name"}}
+        finally:
+            os.unlink(temp_file)
+
+    def test_load_yaml_files(self):
+        """Test several files load in order through one parser."""
+        temp_files = []
+        try:
+            for sitename in ("first-site", "second-site"):
+                with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+                    f.write(f"global:\n  sitename: {sitename}\n")
+                    temp_files.append(f.name)
+
+            parser = YAMLParser()
+            assert parser.validate_all_files(temp_files) == (True, None)
+            documents = parser.load_yaml_files(temp_files)
+            assert [doc["global"]["sitename"] for doc in documents] == [
+                "first-site",
+                "second-site",
+            ]
+
+            with pytest.raises(FileNotFoundError):
+                parser.load_yaml_files(temp_files + ["nonexistent_file.yaml"])
+        finally:
+            for temp_file in temp_files:
+                os.unlink(temp_file)
+
+    def test_load_cache(self):
+        """Test an opt-in cache serves copies of unchanged files."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            f.write("global:\n  sitename: test-site\n")
+            temp_file = f.name
+
+        try:
+            parser = YAMLParser(enable_cache=True)
+            first = parser.load_yaml_file(temp_file)
+            first["global"]["sitename"] = "changed-in-memory"
+            second = parser.load_yaml_file(temp_file)
+            assert second == {"global": {"sitename": "test-site"}}
+            assert len(parser._cache) == 1
+
+            # A file changed on disk is parsed again
+            with open(temp_file, "w") as f:
+                f.write("global:\n  sitename: other-site-name\n")
+            assert parser.load_yaml_file(temp_file) == {"global": {"sitename": "other-site-name"}}
+
+            parser.reset_caches()
+            assert len(parser._cache) == 0
+            assert YAMLParser(enable_cache=False)._cache is None
+        finally:
+            os.unlink(temp_file)
+
+        with pytest.raises(FileNotFoundError):
+            parser.load_yaml_file(temp_file)
+
+    def test_load_utf8_content(self):
+        """Test files are decoded as UTF-8, with or without a BOM."""
+        for prefix in (b"", b"\xef\xbb\xbf"):
+            with tempfile.NamedTemporaryFile(mode="wb", suffix=".yaml", delete=False) as f:
+                f.write(prefix + "global:\n  sitename: 'café-site'\n".encode("utf-8"))
+                temp_file = f.name
+
+            try:
+                data = YAMLParser(enable_cache=False).load_yaml_file(temp_file)
+                assert data == {"global": {"sitename": "café-site"}}
+            finally:
+                os.unlink(temp_file)
+
+    def test_cache_env_var_shares_cache(self, monkeypatch):
+        """Test the environment variable gives parsers one shared cache."""
+        monkeypatch.setenv(CACHE_ENV_VAR, "1")
+        first = YAMLParser()
+        assert first._cache is not None
+        assert YAMLParser()._cache is first._cache
+        assert YAMLParser(format_preserving_load=False)._cache is not first._cache
+        assert YAMLParser(enable_cache=False)._cache is None
+
+        monkeypatch.delenv(CACHE_ENV_VAR)
+        assert YAMLParser()._cache is None
+
+    def test_get_default_parser_is_shared(self):
+        """Test the default parser is created once and reused."""
+        parser = get_default_parser()
+
+        assert isinstance(parser, YAMLParser)
+        assert get_default_parser() is parser
+        assert get_default_parser(format_preserving_load=False) is not parser
+
+    def test_fast_load_returns_plain_containers(self):
+        """Test loading without format preservation yields plain dicts and lists."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            f.write("# comment\nglobal:\n  sitename: 'test-site'\n  hosts: [a, b]\n")
+            temp_file = f.name
+
+        try:
+            data = YAMLParser(format_preserving_load=False).load_yaml_file(temp_file)
+            assert data == {"global": {"sitename": "test-site", "hosts": ["a", "b"]}}
+            assert type(data) is dict
+            assert type(data["global"]["hosts"]) is list
+
+            # The default still loads in round-trip mode
+            assert type(YAMLParser().load_yaml_file(temp_file)) is not dict
+        finally:
+            os.unlink(temp_file)
@@ -7,6 +7,7 @@ This script tests the dynamic analysis and rulebook generation functionality.
 
 import sys
 import os
+import tempfile
 from pathlib import Path
 
 # Add the src directory to the Python path
@@ -207,6 +208,112 @@ def test_merger_with_rulebook():
     return True
 
 
+def test_rulebook_path_patterns():
+    """Test wildcard path patterns are compiled once and matched correctly."""
+    print("Testing rulebook path patterns...")
+    
+    manager = RulebookManager()
+    assert manager.has_rules() is False
+    assert manager.uses_nsprev_values() is False
+    manager.rules = manager.create_default_rulebook()
+    assert manager.has_rules() is True
+    assert manager.uses_nsprev_values() is True
+    manager.add_path_override("api.*.labels", "nsprev")
+    
+    assert manager._path_matches("api.externalService.labels", "api.*.labels")
+    assert not manager._path_matches("api.a.b.labels", "api.*.labels")
+    assert manager._path_matches("svc.ports[3].name", "svc.ports[*].name")
+    assert manager._path_matches("mgm.annotations", "mgm.annotations")
+    assert manager.pattern_cache["mgm.annotations"] is None
+    assert manager.get_merge_strategy("api.externalService.labels") == "nsprev"
+    
+    # The first override in rulebook order wins when several match
+    manager.add_path_override("api.externalService.labels", "merge")
+    assert manager.match_path_override("api.externalService.labels") == "api.*.labels"
+    assert manager.match_path_override("api.externalService.annotations") is None
+    
+    # Global rules match case-insensitively, including singular forms
+    assert manager.get_merge_strategy("mgm.podAnnotation") == "merge"
+    assert manager.get_merge_strategy("mgm.commonLabels") == "merge"
+    assert manager.get_merge_strategy("mgm.replicas") == "engnew"
+    
+    # Explicit-rule lookups are memoised and invalidated by new overrides
+    assert manager.has_explicit_rule("mgm.annotations") is True
+    assert manager.has_explicit_rule("mgm.replicas") is False
+    manager.add_path_override("mgm.*", "engnew")
+    assert manager.has_explicit_rule("mgm.replicas") is True
+    assert manager.get_explicit_strategy("mgm.replicas") == "engnew"
+    assert manager.get_explicit_strategy("ndb.annotations") == "merge"
+    assert manager.get_explicit_strategy("ndb.replicas") is None
+    
+    # Specific-scope rules match in rulebook order, across all their paths
+    specific = RulebookManager()
+    specific.rules = {
+        'default_strategy': 'engnew',
+        'merge_rules': {
+            'keep_site': {'strategy': 'nsprev', 'scope': 'specific',
+                          'paths': ['db.host', 'svc[*].labels']},
+            'combine': {'strategy': 'merge', 'scope': 'specific',
+                        'paths': ['svc[*].*', 'db.host']}
+        }
+    }
+    assert specific.get_merge_strategy("db.host") == "nsprev"
+    assert specific.get_merge_strategy("svc[2].labels") == "nsprev"
+    assert specific.get_merge_strategy("svc[2].annotations") == "merge"
+    assert specific.get_merge_strategy("db.hostname") == "engnew"
+    
+    # Validation rejects unknown and non-string strategies with ValueError
+    for bad_strategy in ("keep", ["merge"]):
+        try:
+            manager._validate_rulebook({'default_strategy': bad_strategy})
+            assert False, f"strategy {bad_strategy!r} accepted"
+        except ValueError:
+            pass
+    
+    print("✓ Wildcard patterns matched")
+    
+    return True
+
+
+def test_rulebook_load_cache():
+    """Test repeated rulebook loads share one parse but not one dict."""
+    print("Testing rulebook load cache...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        rulebook_path = os.path.join(tmp_dir, "rulebook.yaml")
+        manager = RulebookManager()
+        manager.rules = manager.create_default_rulebook()
+        manager.save_rulebook(rulebook_path)
+        
+        first = RulebookManager(rulebook_path)
+        second = RulebookManager(rulebook_path)
+        assert first.rules == second.rules
+        assert first.rules is not second.rules
+        
+        # Mutating one manager's rules must not leak into later loads
+        first.add_path_override("mgm.replicas", "nsprev")
+        assert "mgm.replicas" not in RulebookManager(rulebook_path).rules.get('path_overrides', {})
+        
+        # Rewriting the file is picked up on the next load
+        first.save_rulebook(rulebook_path)
+        os.utime(rulebook_path, ns=(0, 0))
+        assert RulebookManager(rulebook_path).get_merge_strategy("mgm.replicas") == "nsprev"
+        
+        # An invalid rulebook is rejected on every load, not only the first
+        with open(rulebook_path, 'w', encoding='utf-8') as f:
+            f.write("default_strategy: bogus\n")
+        for _ in range(2):
+            try:
+                RulebookManager(rulebook_path)
+                assert False, "invalid rulebook accepted"
+            except ValueError:
+                pass
+    
+    print("✓ Rulebook loads cached per file version")
+    
+    return True
+
+
 def main():
     """Run all tests."""
     print("=" * 60)
@@ -217,7 +324,9 @@ def main():
         test_analyzer,
         test_rulebook_generation,
         test_rulebook_manager,
-        test_merger_with_rulebook
+        test_merger_with_rulebook,
+        test_rulebook_path_patterns,
+        test_rulebook_load_cache
     ]
     
     passed = 0
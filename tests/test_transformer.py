@@ -191,6 +191,52 @@ class TestPathTransformationDetector:
         assert detector._path_exists_in_config("items[1].name", config) is True
         assert detector._path_exists_in_config("items[2].name", config) is False
     
+    def test_lookup_path_distinguishes_missing_from_none(self):
+        """Test single-walk lookup reports existence alongside the value."""
+        detector = PathTransformationDetector()
+        
+        config = {
+            "api": {"timeout": None},
+            "items": [{"name": "item1"}]
+        }
+        
+        assert detector._lookup_path(config, "api.timeout") == (True, None)
+        assert detector._lookup_path(config, "api.port") == (False, None)
+        assert detector._lookup_path(config, "items[0].name") == (True, "item1")
+        assert detector._lookup_path(config, "items[3].name") == (False, None)
+        assert detector._lookup_path(config, "api[0]") == (False, None)
+    
+    def test_path_index_matches_path_walk(self):
+        """Test the reference path index agrees with walking the config."""
+        detector = PathTransformationDetector()
+        
+        reference = {
+            "api": {"service": {"name": "test"}},
+            "items": [{"name": "item1"}, "plain"],
+            5: {"hidden": True}
+        }
+        detector._reference_config = reference
+        detector._reference_index = detector._build_path_index(reference)
+        
+        for path in ["api", "api.service.name", "api.port", "items[1]",
+                     "items[0].name", "items[2]", "5.hidden", "items[1].x"]:
+            assert detector._path_exists_in_reference(path, reference) == \
+                detector._path_exists_in_config(path, reference)
+    
+    def test_reference_index_reused_for_same_reference(self):
+        """Test the reference index is built once per reference object."""
+        detector = PathTransformationDetector()
+        reference = {"new": {"account": "svc"}}
+        
+        detector.detect_duplicate_values({"new": {"account": "svc"}}, reference)
+        index = detector._reference_index
+        detector.detect_duplicate_values({"new": {"account": "svc"}}, reference)
+        assert detector._reference_index is index
+        
+        detector.clear_reference_index()
+        detector.detect_duplicate_values({"new": {"account": "svc"}}, reference)
+        assert detector._reference_index is not index
+    
     def test_parse_path_segments_simple(self):
         """Test parsing simple path segments."""
         detector = PathTransformationDetector()
@@ -215,6 +261,35 @@ class TestPathTransformationDetector:
         
         assert segments == ["api", "items", 0, "nested", 1, "value"]
     
+    def test_count_leaf_fields(self):
+        """Test counting scalar fields through nested dicts and lists."""
+        detector = PathTransformationDetector()
+        
+        config = {
+            "a": 1,
+            "b": {"c": 2, "d": {"e": 3}},
+            "f": [{"g": 4, "h": 5}, "i", [6, 7]],
+            "j": {}
+        }
+        
+        assert detector._count_leaf_fields(config) == 7
+        assert detector._count_leaf_fields(["not", "a", "dict"]) == 0
+        assert detector._count_leaf_fields(config, limit=7) == 7
+        assert detector._count_leaf_fields(config, limit=2) > 2
+    
+    def test_is_child_of_any(self):
+        """Test matching a path against a set of parent paths."""
+        detector = PathTransformationDetector()
+        
+        parent_paths = {"global.nfInstanceId", "services", "a.b[0]"}
+        
+        assert detector._is_child_of_any("global.nfInstanceId.value", parent_paths)
+        assert detector._is_child_of_any("services[1].name", parent_paths)
+        assert detector._is_child_of_any("a.b[0].c", parent_paths)
+        assert not detector._is_child_of_any("global.nfInstanceIdx", parent_paths)
+        assert not detector._is_child_of_any("services", parent_paths)
+        assert not detector._is_child_of_any("a.b", parent_paths)
+    
     def test_apply_transformations_move(self):
         """Test applying move transformations."""
         detector = PathTransformationDetector()
@@ -240,6 +315,29 @@ class TestPathTransformationDetector:
         # New path should still exist
         assert result["newPath"] == "old-value"
     
+    def test_apply_transformations_leaves_input_unchanged(self):
+        """Test applying transformations works on a copy of the config."""
+        detector = PathTransformationDetector()
+        
+        config = {
+            "old": {"account": "svc"},
+            "new": {"account": "default"}
+        }
+        
+        transformation = TransformationRecord(
+            old_path="old.account",
+            new_path="new.account",
+            value="svc",
+            recommendation="move",
+            reason="test",
+            confidence="high"
+        )
+        
+        result = detector.apply_transformations(config, [transformation])
+        
+        assert result == {"new": {"account": "svc"}}
+        assert config == {"old": {"account": "svc"}, "new": {"account": "default"}}
+    
     def test_remove_path_simple(self):
         """Test removing a simple path."""
         detector = PathTransformationDetector()
@@ -290,6 +388,20 @@ class TestPathTransformationDetector:
         # Second item should be unchanged
         assert result["items"][1]["name"] == "item2"
     
+    def test_remove_path_cleans_up_empty_parents(self):
+        """Test parents emptied by a removal are removed up to the first non-empty one."""
+        detector = PathTransformationDetector()
+        
+        config = {
+            "keep": 1,
+            "a": {"b": [{"c": {"d": "x"}}], "sibling": "y"}
+        }
+        
+        result = detector._remove_path(config, "a.b[0].c.d")
+        
+        assert result == {"keep": 1, "a": {"sibling": "y"}}
+        assert config["a"]["b"][0]["c"]["d"] == "x"
+    
     def test_generate_transformation_report_empty(self):
         """Test generating report with no transformations."""
         detector = PathTransformationDetector()